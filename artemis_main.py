@@ -5,11 +5,13 @@ operations for the bot.
 """
 import os
 import re
+import signal
 import sys
 import time
 import traceback
 import yaml
 from ast import literal_eval
+from collections import Counter
 from random import choice
 
 import praw
@@ -33,6 +35,15 @@ from text import *
 
 # Number of regular top-level routine runs that have been made.
 ISOCHRONISMS = 0
+# Lowercase prefix shared by all of my instances' usernames, and the
+# lowercase name of AutoModerator. Posts by these are not processed.
+USERNAME_PREFIX = INFO.username[:12].lower()
+AUTOMODERATOR = "automoderator"
+# Cache of the post flair templates retrieved for each subreddit,
+# indexed by subreddit with a tuple of (time retrieved, templates).
+# Entries are reused for `TEMPLATES_CACHE_SECONDS` before refreshing.
+TEMPLATES_CACHE = {}
+TEMPLATES_CACHE_SECONDS = 600
 
 
 """WIDGET UPDATING FUNCTIONS"""
@@ -136,7 +147,7 @@ def wikipage_config(subreddit_name):
 
         # If the page exists, then we get the PRAW Wikipage object here.
         config_wikipage = r.wiki[page_name]
-        logger.debug("Wikipage Config: Config wikipage found, length {}.".format(len(config_test)))
+        logger.debug("Wikipage Config: Config wikipage found, length %s.", len(config_test))
     except prawcore.exceptions.NotFound:
         # The page does *not* exist. Let's create the config page.
         reason_msg = "Creating the Artemis config wiki page."
@@ -369,7 +380,7 @@ def wikipage_access_history(action, data_package):
 """TEMPLATE FUNCTIONS"""
 
 
-def subreddit_templates_retrieve(subreddit_name, display_mod_flairs=False):
+def subreddit_templates_retrieve(subreddit_name, display_mod_flairs=False, use_cache=True):
     """Retrieve the templates that are available for a particular
     subreddit's post flairs.
 
@@ -387,6 +398,10 @@ def subreddit_templates_retrieve(subreddit_name, display_mod_flairs=False):
                                Not used now but is an option.
                                * True: Display mod-only flairs.
                                * False (default): Don't.
+    :param use_cache: Whether recently retrieved templates can be
+                      returned instead of asking Reddit again. Set this
+                      to `False` when a moderator may have just edited
+                      the flairs. Fresh results still update the cache.
     :return: A dictionary of the templates available on that subreddit,
              indexed by their flair text.
              This dictionary will be empty if Artemis is unable to
@@ -397,6 +412,14 @@ def subreddit_templates_retrieve(subreddit_name, display_mod_flairs=False):
     subreddit_templates = {}
     order = 1
 
+    # Check if we have retrieved these templates recently. Mod-only
+    # flairs are never cached since they are a different set.
+    cache_key = subreddit_name.lower()
+    if use_cache and not display_mod_flairs and cache_key in TEMPLATES_CACHE:
+        cached_time, cached_templates = TEMPLATES_CACHE[cache_key]
+        if time.time() - cached_time < TEMPLATES_CACHE_SECONDS:
+            return cached_templates
+
     # Determine the status of the subreddit.
     # `public` is normal, `private`, and the `Forbidden` exception if
     # it is a quarantined subreddit.
@@ -432,14 +455,15 @@ def subreddit_templates_retrieve(subreddit_name, display_mod_flairs=False):
             # same order it is on the sub.
             order += 1
         logger.debug(
-            "Templates Retrieve: r/{} templates are: {}".format(
-                subreddit_name, subreddit_templates
-            )
+            "Templates Retrieve: r/%s templates are: %s", subreddit_name, subreddit_templates
         )
     except prawcore.exceptions.Forbidden:
         # The flairs don't appear to be available to me.
         # It may be that they are mod-only. Return an empty dictionary.
-        logger.debug("Templates Retrieve: r/{} templates not accessible.".format(subreddit_name))
+        logger.debug("Templates Retrieve: r/%s templates not accessible.", subreddit_name)
+
+    if not display_mod_flairs:
+        TEMPLATES_CACHE[cache_key] = (time.time(), subreddit_templates)
 
     return subreddit_templates
 
@@ -456,7 +480,7 @@ def subreddit_templates_collater(subreddit_name, extended_data=None):
                           their specific scheduled days.
     :return: A Markdown-formatted bulleted list of templates.
     """
-    formatted_order = {}
+    lines = []
 
     # Get the flair schedule if present.
     if extended_data is not None:
@@ -470,9 +494,9 @@ def subreddit_templates_collater(subreddit_name, extended_data=None):
     template_dictionary = subreddit_templates_retrieve(subreddit_name)
 
     # Iterate over the templates and format them nicely as a list.
-    for template in template_dictionary.keys():
-        template_order = template_dictionary[template]["order"]
-        template_id = template_dictionary[template]["id"]
+    # The dictionary is already in the order of the flair selector.
+    for template, template_data in template_dictionary.items():
+        template_id = template_data["id"]
 
         # Check if there's extended data.
         if extended_data:
@@ -485,13 +509,10 @@ def subreddit_templates_collater(subreddit_name, extended_data=None):
             if specific_schedule[1]:
                 permitted = [timekeeping.convert_weekday_text(x) for x in specific_schedule[1]]
                 raw_data += " (only on {})".format(", ".join(permitted))
-            formatted_order[template_order] = raw_data
+            lines.append("* {}".format(raw_data))
         else:
             # No schedule data, just format it accordingly.
-            formatted_order[template_order] = flair_sanitizer(template, False)
-
-    # Reorder and format each line.
-    lines = ["* {}".format(formatted_order[key]) for key in sorted(formatted_order.keys())]
+            lines.append("* {}".format(flair_sanitizer(template, False)))
 
     return "\n".join(lines)
 
@@ -499,7 +520,7 @@ def subreddit_templates_collater(subreddit_name, extended_data=None):
 """ADVANCED SUB-FUNCTIONS"""
 
 
-def advanced_send_alert(submission_obj, list_of_users):
+def advanced_send_alert(submission_obj, list_of_users, moderators_cache=None):
     """A small function to send a message to moderators who want to be
     notified each time a removal action is taken. This is not a
     widely-used function and in v1.6 was surfaced for others to use
@@ -508,11 +529,13 @@ def advanced_send_alert(submission_obj, list_of_users):
     :param submission_obj: A PRAW submission object.
     :param list_of_users: A list of users to notify.
                           They must be moderators.
+    :param moderators_cache: An optional dictionary of moderator sets,
+                             passed on to `flair_is_user_mod`.
     :return: Nothing.
     """
     sub_name = submission_obj.subreddit.display_name.lower()
     for user in list_of_users:
-        if flair_is_user_mod(user, sub_name):
+        if flair_is_user_mod(user, sub_name, moderators_cache):
 
             # Form the message to send to the moderator.
             alert = "I removed this [unflaired post here](https://www.reddit.com{}).".format(
@@ -686,9 +709,7 @@ def messaging_parse_flair_response(subreddit_name, response_text, post_id):
     if response_text in lowercased_flair_dict:
         returned_template = lowercased_flair_dict[response_text]["id"]
         logger.debug(
-            "Parse Response: > Found r/{} template: `{}`.".format(
-                subreddit_name, returned_template
-            )
+            "Parse Response: > Found r/%s template: `%s`.", subreddit_name, returned_template
         )
         database.counter_updater(
             subreddit_name, "Parsed exact flair in message", "main", post_id=post_id, id_only=True
@@ -859,7 +880,11 @@ def messaging_op_approved(subreddit_name, praw_submission, strict_mode=True, mod
         name_to_use = extended_data.get("custom_name", "Artemis").replace(" ", " ^")
         if not name_to_use:
             name_to_use = "Artemis"
-        bye_phrase = extended_data.get("custom_goodbye", choice(GOODBYE_PHRASES)).capitalize()
+        # A random phrase is only chosen if there is no custom goodbye.
+        bye_phrase = extended_data.get("custom_goodbye")
+        if bye_phrase is None:
+            bye_phrase = choice(GOODBYE_PHRASES)
+        bye_phrase = bye_phrase.capitalize()
         if not bye_phrase:
             bye_phrase = "Have a good day"
 
@@ -951,17 +976,19 @@ def messaging_example_collater(subreddit):
 
     # Combine everything together. This is one of the few places where
     # `BOT_DISCLAIMER` is used outside a runtime.
-    message_to_send = MSG_USER_FLAIR_BODY.format(
-        "USERNAME",
-        subreddit.display_name,
-        sub_templates,
-        post_permalink,
-        post_permalink,
-        removal_section,
-        bye_phrase,
-        flair_option,
-        "EXAMPLE POST TITLE",
-        custom_text,
+    message_to_send = MSG_USER_FLAIR_BODY.format_map(
+        {
+            "username": "USERNAME",
+            "subreddit": subreddit.display_name,
+            "templates": sub_templates,
+            "permalink": post_permalink,
+            "modmail_link": post_permalink,
+            "removal": removal_section,
+            "goodbye": bye_phrase,
+            "flair_option": flair_option,
+            "title": "EXAMPLE POST TITLE",
+            "custom_text": custom_text,
+        }
     )
     reply_text = "{}\n\n---\n\n{}".format(template_header, message_to_send)
     reply_text += BOT_DISCLAIMER.format(subreddit.display_name).replace("Artemis", name_to_use)
@@ -1006,16 +1033,14 @@ def flair_notifier(post_object, message_to_send):
     message_body = message_to_send + disclaimer_to_use
     try:
         reddit.redditor(author).message(subject_line, message_body)
-        logger.debug("Notifier: Messaged u/{} about post `{}`.".format(author, post_object.id))
+        logger.debug("Notifier: Messaged u/%s about post `%s`.", author, post_object.id)
     except praw.exceptions.APIException:
-        logger.debug(
-            "Notifier: Error sending message to u/{} about `{}`.".format(author, post_object.id)
-        )
+        logger.debug("Notifier: Error sending message to u/%s about `%s`.", author, post_object.id)
 
     return
 
 
-def flair_none_saver(post_object):
+def flair_none_saver(post_object, commit=True):
     """This function removes a post that lacks flair and saves it to
     the database to check later. It saves the post ID as well as the
     time it was created. The `main_flair_checker` function will check
@@ -1024,41 +1049,58 @@ def flair_none_saver(post_object):
 
     :param post_object: PRAW Submission object of the post
                         missing a flair.
+    :param commit: Whether to commit the insertion right away. If
+                   `False`, it is committed with the caller's next
+                   commit on the main database.
     :return: Nothing.
     """
     # Get the unique Reddit ID of the post.
     post_id = post_object.id
 
-    # First we want to check if the post ID has already been saved.
-    database.CURSOR_MAIN.execute("SELECT * FROM posts_filtered WHERE post_id = ?", (post_id,))
-    result = database.CURSOR_MAIN.fetchone()
+    # Save the post ID only if it has not already been saved. The check
+    # is part of the insertion so that it takes a single statement.
+    database.CURSOR_MAIN.execute(
+        "INSERT INTO posts_filtered SELECT ?, ? "
+        "WHERE NOT EXISTS (SELECT 1 FROM posts_filtered WHERE post_id = ?)",
+        (post_id, int(post_object.created_utc), post_id),
+    )
 
-    if result is None:  # ID has not been saved before. We can save it.
-        database.CURSOR_MAIN.execute(
-            "INSERT INTO posts_filtered VALUES (?, ?)", (post_id, int(post_object.created_utc))
-        )
-        database.CONN_MAIN.commit()
-        logger.debug("Flair Saver: Added post {} to the filtered database.".format(post_id))
+    if database.CURSOR_MAIN.rowcount:  # ID has not been saved before.
+        if commit:
+            database.CONN_MAIN.commit()
+        logger.debug("Flair Saver: Added post %s to the filtered database.", post_id)
 
     return
 
 
-def flair_is_user_mod(query_username, subreddit_name):
+def flair_is_user_mod(query_username, subreddit_name, moderators_cache=None):
     """This function checks to see if a user is a moderator in the sub
     they posted in. Artemis WILL NOT remove an unflaired post if it's
     by a moderator unless there's a special setting in extended data.
 
     :param query_username: The username of the person.
     :param subreddit_name: The subreddit in which they posted a comment.
+    :param moderators_cache: An optional dictionary of moderator sets
+                             indexed by subreddit. If passed, the set
+                             is only fetched from Reddit once and is
+                             reused on subsequent calls.
     :return: `True` if they are a moderator, `False` if they are not.
     """
-    # Fetch the moderator list.
-    moderators_list = [mod.name.lower() for mod in reddit.subreddit(subreddit_name).moderator()]
+    # Fetch the moderators as a set, unless we already have it cached,
+    # so that repeated membership checks against it are cheap.
+    if moderators_cache is not None and subreddit_name in moderators_cache:
+        moderators_set = moderators_cache[subreddit_name]
+    else:
+        moderators_set = frozenset(
+            mod.name.lower() for mod in reddit.subreddit(subreddit_name).moderator()
+        )
+        if moderators_cache is not None:
+            moderators_cache[subreddit_name] = moderators_set
 
-    # Go through the list and check the users to see if they are mods.
+    # Check the user against the set to see if they are a mod.
     # Return `True` if the user is a moderator, `False` if they are not.
-    if query_username.lower() in moderators_list:
-        logger.debug("Is User Mod: u/{} is a mod of r/{}.".format(query_username, subreddit_name))
+    if query_username.lower() in moderators_set:
+        logger.debug("Is User Mod: u/%s is a mod of r/%s.", query_username, subreddit_name)
         return True
     else:
         return False
@@ -1241,18 +1283,20 @@ def main_query_operations(id_list, specific_subreddit=None):
             continue
 
         # Fetch the local operations data.
-        database.CURSOR_MAIN.execute("SELECT * FROM posts_operations WHERE id = ?", (post_id,))
+        database.CURSOR_MAIN.execute(
+            "SELECT operations FROM posts_operations WHERE id = ?", (post_id,)
+        )
         operation_result = database.CURSOR_MAIN.fetchone()
         if not operation_result:  # Exit if no local results.
             continue
 
-        operation_dict = literal_eval(operation_result[1])
+        operation_dict = literal_eval(operation_result[0])
         operations_dictionary[post_id] = (equivalent_submission, operation_dict)
 
     # Iterate over our dictionary and generate a formatted chunk for
     # each submission.
     ids_formatted = []
-    for post_id in list(sorted(operations_dictionary.keys())):
+    for post_id in sorted(operations_dictionary):
         praw_object = operations_dictionary[post_id][0]
         dict_object = operations_dictionary[post_id][1]
         item_created = timekeeping.time_convert_to_string(praw_object.created_utc)
@@ -1286,7 +1330,7 @@ def main_query_operations(id_list, specific_subreddit=None):
         # line in the table.
         table_lines = ["| {} | User created post |".format(item_created)]
         table_header = "\n\n| Time (UTC) | Action |\n|------------|--------|\n"
-        for item in list(sorted(dict_object.keys())):
+        for item in sorted(dict_object):
             line = "| {} | {} |".format(
                 timekeeping.time_convert_to_string(item), dict_object[item]
             )
@@ -1381,7 +1425,7 @@ def main_post_approval(submission, template_id=None, extended_data=None):
         if moderator_removed != USERNAME_REG:
             # The moderator who removed this is not me. Don't restore.
             logger.debug(
-                "Post Approval: Post `{}` removed by mod u/{}.".format(post_id, moderator_removed)
+                "Post Approval: Post `%s` removed by mod u/%s.", post_id, moderator_removed
             )
             database.counter_updater(
                 post_subreddit,
@@ -1409,10 +1453,10 @@ def main_post_approval(submission, template_id=None, extended_data=None):
     # If that's true, the post is not eligible for processing.
     try:
         post_author = submission.author.name
-        logger.debug("Post Approval: Post author is u/{}.".format(post_author))
+        logger.debug("Post Approval: Post author is u/%s.", post_author)
     except AttributeError:
         # Author is deleted.
-        logger.debug("Post Approval: Post `{}` author deleted.".format(post_id))
+        logger.debug("Post Approval: Post `%s` author deleted.", post_id)
         database.counter_updater(
             post_subreddit, "Author deleted", "main", post_id=post_id, id_only=True
         )
@@ -1426,8 +1470,9 @@ def main_post_approval(submission, template_id=None, extended_data=None):
     if not can_process:
         database.delete_filtered_post(post_id)
         logger.debug(
-            "Post Approval: Post `{}` not eligible for processing. "
-            "Deleted from filtered database.".format(post_id)
+            "Post Approval: Post `%s` not eligible for processing. "
+            "Deleted from filtered database.",
+            post_id,
         )
         return False
 
@@ -1435,14 +1480,16 @@ def main_post_approval(submission, template_id=None, extended_data=None):
     # just using the `main_flair_checker` routine to check if it has
     # a flair. This DOES NOT delete the post from the database.
     if template_id is None and post_css is None and post_flair_text is None:
-        logger.debug("Post Approval: Post `{}` still lacks flair.".format(post_id))
+        logger.debug("Post Approval: Post `%s` still lacks flair.", post_id)
         return False
 
     # Get our permissions for this subreddit.
     # If Artemis is not a mod of this subreddit, Don't do anything.
     # This makes an API call, so we try to exit as much as possible
     # before it to speed things up.
-    current_permissions = connection.obtain_mod_permissions(post_subreddit, INSTANCE)
+    current_permissions = connection.obtain_mod_permissions(
+        post_subreddit, INSTANCE, use_cache=True
+    )
     if not current_permissions[0]:
         return False
     else:
@@ -1464,8 +1511,10 @@ def main_post_approval(submission, template_id=None, extended_data=None):
             # We flair it with the template ID that was provided.
             submission.flair.select(template_id)
             logger.debug(
-                "Post Approval: Directly flaired post `{}` on r/{} "
-                "with template `{}`.".format(post_id, post_subreddit, template_id)
+                "Post Approval: Directly flaired post `%s` on r/%s with template `%s`.",
+                post_id,
+                post_subreddit,
+                template_id,
             )
         else:
             # The reply was to select a flair but we do not have the
@@ -1979,7 +2028,8 @@ def main_messaging():
 
             # Check for the templates that are available to Artemis and
             # see how many flair templates we can find.
-            template_number = len(subreddit_templates_retrieve(relevant_subreddit))
+            templates = subreddit_templates_retrieve(relevant_subreddit, use_cache=False)
+            template_number = len(templates)
 
             # There are no publicly available flairs for this sub.
             # Let the mods know.
@@ -2142,7 +2192,9 @@ def main_messaging():
             # Also check to see if there are *actually* public flairs
             # available now. If there aren't any, append a header
             # letting the mods know.
-            available_templates = subreddit_templates_retrieve(msg_subreddit.display_name)
+            available_templates = subreddit_templates_retrieve(
+                msg_subreddit.display_name, use_cache=False
+            )
             example_text = messaging_example_collater(msg_subreddit)
             if not len(available_templates):
                 warning_header = MSG_MOD_INIT_NO_FLAIRS.rsplit("\n", 3)[0]
@@ -2350,23 +2402,26 @@ def main_flair_checker():
     fullname_ids = []
 
     # Access the database.
-    database.CURSOR_MAIN.execute("SELECT * FROM posts_filtered")
+    database.CURSOR_MAIN.execute("SELECT post_id, post_created FROM posts_filtered")
     results = database.CURSOR_MAIN.fetchall()
 
     # If we have results, iterate over them, checking for age.
     # Note: Each result is a tuple with the ID in [0] and the
-    # created Unix UTC time in [1] of the tuple.
+    # created Unix UTC time in [1] of the tuple. The deletions of old
+    # posts are committed together when the block exits.
     if len(results) != 0:
-        for result in results:
-            short_id = result[0]
-            if int(time.time()) - result[1] > SETTINGS.max_monitor_sec:
-                database.delete_filtered_post(short_id)
-                database.counter_updater(
-                    None, "Cleared post", "main", post_id=short_id, id_only=True
-                )
-                logger.debug("Flair Checker: Deleted `{}` as it is too old.".format(short_id))
-            else:
-                fullname_ids.append("t3_{}".format(short_id))
+        current_time = int(time.time())
+        with database.CONN_MAIN:
+            for result in results:
+                short_id = result[0]
+                if current_time - result[1] > SETTINGS.max_monitor_sec:
+                    database.delete_filtered_post(short_id, commit=False)
+                    database.counter_updater(
+                        None, "Cleared post", "main", post_id=short_id, id_only=True, commit=False
+                    )
+                    logger.debug("Flair Checker: Deleted `%s` as it is too old.", short_id)
+                else:
+                    fullname_ids.append("t3_{}".format(short_id))
 
         # We have posts to look over. Convert the fullname IDs to PRAW
         # objects with `.info()`.
@@ -2377,8 +2432,7 @@ def main_flair_checker():
             # Pass the submission to the unified routine for processing.
             main_post_approval(submission)
             logger.debug(
-                "Flair Checker: Passed the post `{}` for "
-                "approval checking.".format(submission.id)
+                "Flair Checker: Passed the post `%s` for approval checking.", submission.id
             )
 
     return
@@ -2448,46 +2502,93 @@ def main_get_submissions(statistics_mode=False):
         logger.info("Get: There are no subreddit sections to monitor. Exiting.")
         return
 
-    for section in sections:
+    # Each section is a single `+`-joined multireddit, so every section
+    # is one listing request. The listings are fully fetched here before
+    # any processing is done, so that the loop below does not interleave
+    # further requests for new pages with its own work.
+    for section_number, section in enumerate(sections, start=1):
         if ISOCHRONISMS == 0:
             logger.info(
                 "Get: Starting fresh for section number {} "
-                "as there are 0 isochronisms.".format(sections.index(section) + 1)
+                "as there are 0 isochronisms.".format(section_number)
             )
             pull_num = 1000
-        elif statistics_mode and ISOCHRONISMS != 0:
+        elif statistics_mode:
             pull_num = int(NUMBER_TO_FETCH)
         else:
             pull_num = int(NUMBER_TO_FETCH / SETTINGS.num_chunks)
-        posts += list(reddit.subreddit(section).new(limit=pull_num))
+        posts.extend(reddit.subreddit(section).new(limit=pull_num))
     posts.sort(key=lambda x: x.id.lower())
     processed = []  # List containing processed IDs as tuples.
 
-    # Fetch the IDs from the database to check against later.
-    database.CURSOR_MAIN.execute("SELECT post_id FROM posts_processed")
-    previously_recorded = database.CURSOR_MAIN.fetchall()[-5000:]
-    previously_recorded = [x[0] for x in previously_recorded]
+    # Perform the age check on all the posts at once. A post should be
+    # older than our minimum age, since we give OPs `min_monitor_sec`
+    # seconds to choose a flair. It should also be younger than
+    # `SETTINGS.max_monitor_sec / 4` seconds (6 hours). Artemis may
+    # have just been invited to moderate a subreddit; it should not act
+    # on every old post.
+    current_time = time.time()
+    maximum_age = SETTINGS.max_monitor_sec / 4
+    posts_in_window = [
+        x for x in posts if SETTINGS.min_monitor_sec <= current_time - x.created_utc <= maximum_age
+    ]
+    logger.debug(
+        "Get: %s of %s fetched posts are within the age limits.",
+        len(posts_in_window),
+        len(posts),
+    )
+
+    # The moderator lists of each subreddit are cached for the duration
+    # of this run, so that they are fetched from Reddit at most once per
+    # subreddit rather than once per post. Our mod permissions are
+    # cached by `connection.obtain_mod_permissions` itself.
+    moderators_cache = {}
+    extended_cache = {}
+    templates_cache = {}
+
+    # Subreddit action counts are tallied here and written to the
+    # database once at the end, rather than once for every post.
+    # The per-post operations log is still written as we go.
+    actions_counter = Counter()
+    # New posts that already have a flair are counted and reported in a
+    # single debug line at the end, rather than one line per post.
+    already_flaired = 0
+
+    # Messages to OPs and alerts to moderators are queued up here and
+    # sent only after the database work for this run has been saved.
+    notifications_queue = []
+    alerts_queue = []
+
+    # Check the fetched IDs against the database in a single pass to
+    # find the ones that have already been processed.
+    previously_recorded = database.processed_retrieve([x.id for x in posts_in_window])
 
     # Iterate over the fetched posts. We have a number of built-in
     # checks to reduce the amount of processing.
-    for post in posts:
-
-        # Check to see if this is a subreddit with flair enforcing.
-        # Also retrieve a dictionary containing extended data.
-        post_subreddit = post.subreddit.display_name.lower()
-        sub_ext_data = database.extended_retrieve(post_subreddit)
-        if not database.monitored_subreddits_enforce_status(post_subreddit):
-            continue
+    # The cheapest checks come first, so that posts which will be
+    # skipped anyway have as little looked up for them as possible.
+    for post in posts_in_window:
 
         # Check to see if the post has already been processed.
         # We used to check the database each run time, but now simply
-        # check against a one-time pull earlier.
+        # check against a one-time batched query earlier.
         post_id = post.id
         if post_id in previously_recorded:
             # Post is already in the database.
-            logger.debug("Get: Post {} recorded in the processed database. Skip.".format(post_id))
+            logger.debug("Get: Post %s recorded in the processed database. Skip.", post_id)
             continue
 
+        # Check to see if this is a subreddit with flair enforcing.
+        # Only then retrieve a dictionary containing extended data.
+        # The extended data is only loaded once per subreddit per run.
+        post_subreddit_name = post.subreddit.display_name
+        post_subreddit = post_subreddit_name.lower()
+        if not database.monitored_subreddits_enforce_status(post_subreddit, cached=True):
+            continue
+        if post_subreddit not in extended_cache:
+            extended_cache[post_subreddit] = database.extended_retrieve(post_subreddit)
+        sub_ext_data = extended_cache[post_subreddit]
+
         # Check if the author exists. If they don't, give them the same
         # text Reddit would, which is `[deleted]`.
         try:
@@ -2495,61 +2596,39 @@ def main_get_submissions(statistics_mode=False):
         except AttributeError:
             post_author = "[deleted]"
 
-        # Checks for the age of this post. We have a minimum and maximum
-        # age. First check how many seconds old this post is.
-        time_difference = time.time() - post.created_utc
-
-        # Perform the age check. It should be older than our minimum age
-        # and less than our maximum. We give OPs `minimum_age` seconds
-        # to choose a flair. If it's a post that's younger than this,
-        # skip.
-        if time_difference < SETTINGS.min_monitor_sec:
-            logger.debug(
-                "Get: Post {} is < {}s old. Skip.".format(post_id, SETTINGS.min_monitor_sec)
-            )
-            continue
-
-        # If the time difference is greater than
-        # `SETTINGS.max_monitor_sec / 4` seconds, skip (at 6 hours).
-        # Artemis may have just been invited to moderate a subreddit; it
-        # should not act on every old post.
-        elif time_difference > (SETTINGS.max_monitor_sec / 4):
-            msg = "Get: Post {} is over {} seconds old. Skipped."
-            logger.debug(msg.format(post_id, (SETTINGS.max_monitor_sec / 4)))
-            continue
-
-        # Define basic attributes of the post.
+        # Define basic attributes of the post. These are read once here
+        # and only the local values are used for the rest of the loop.
         post_flair_css = post.link_flair_css_class
         post_flair_text = post.link_flair_text
         post_permalink = post.permalink
         post_nsfw = post.over_18
+        post_title_original = post.title
 
         # If the post is NSFW, we want to truncate the displayed text
         # on the terminal. Otherwise, replace potentially problematic
         # closing brackets.
         if post_nsfw:
-            post_title = "{}...".format(post.title[:10])
+            post_title = "{}...".format(post_title_original[:10])
         else:
-            post_title = markdown_escaper(post.title)
+            post_title = markdown_escaper(post_title_original)
 
         # Insert this post's ID into the processed list for insertion.
         # This is done as a tuple. If using a single insertion schema,
         # this is where it would have gone.
         processed.append((post_id,))
-        log_line = (
-            'Get: New Post "{}" on r/{} (https://redd.it/{}), flaired with "{}". '
-            "Added to processed database."
+        logger.info(
+            f'Get: New Post "{post_title}" on r/{post_subreddit} (https://redd.it/{post_id}), '
+            f'flaired with "{post_flair_text}". Added to processed database.'
+        )
+        database.counter_updater(
+            None, "Fetched post", "main", post_id=post_id, id_only=True, commit=False
         )
-        logger.info(log_line.format(post_title, post_subreddit, post_id, post_flair_text))
-        database.counter_updater(None, "Fetched post", "main", post_id=post_id, id_only=True)
 
         # Check to see if the author is me or AutoModerator.
         # If it is, don't process.
-        if (
-            post_author.lower().startswith(INFO.username[:12].lower())
-            or post_author.lower() == "automoderator"
-        ):
-            logger.info("Get: > Post `{}` is by me or AutoModerator. Skipped.".format(post_id))
+        post_author_lower = post_author.lower()
+        if post_author_lower.startswith(USERNAME_PREFIX) or post_author_lower == AUTOMODERATOR:
+            logger.info(f"Get: > Post `{post_id}` is by me or AutoModerator. Skipped.")
             continue
 
         # We check for posts that have no flairs whatsoever.
@@ -2559,90 +2638,102 @@ def main_get_submissions(statistics_mode=False):
 
             # Get our permissions for this subreddit.
             # If we are not a mod of this subreddit, don't do anything.
-            # Otherwise, collect the mod permissions as a list.
-            current_permissions = connection.obtain_mod_permissions(post_subreddit, INSTANCE)
+            # Otherwise, collect the mod permissions as a set and check
+            # whether we can remove posts and flair them.
+            current_permissions = connection.obtain_mod_permissions(
+                post_subreddit, INSTANCE, use_cache=True
+            )
             if not current_permissions[0]:
                 continue
             else:
-                current_permissions_list = current_permissions[1]
+                current_permissions_set = set(current_permissions[1])
+                can_remove = bool(current_permissions_set & {"posts", "all"})
+                can_flair = bool(current_permissions_set & {"flair", "all"})
+
+            # Read the settings we need from the extended data once.
+            # By default moderators will *not* have their posts flair
+            # enforced, and removed posts will be automatically approved
+            # once they are flaired. The whitelist and alert list are
+            # already stored in lowercase.
+            enforce_moderators = sub_ext_data.get("flair_enforce_moderators", False)
+            enforce_whitelist = sub_ext_data.get("flair_enforce_whitelist") or []
+            enforce_alert_list = sub_ext_data.get("flair_enforce_alert_list") or []
+            auto_approve = sub_ext_data.get("flair_enforce_approve_posts", True)
+            custom_goodbye = sub_ext_data.get("custom_goodbye")
+            logger.debug(
+                "Get: > r/%s mods flair enforcement: %s.", post_subreddit, enforce_moderators
+            )
 
             # Check to see if the author is a moderator.
-            # Artemis will not remove unflaired posts by mods.
-            # But also check extended data for a boolean that denotes
-            # whether or not flair enforcing should be conducted on
-            # moderators.
-            if "flair_enforce_moderators" in sub_ext_data:
-                enforce_moderators = sub_ext_data["flair_enforce_moderators"]
-                logger.debug(
-                    "Get: > r/{} mods flair enforcement: {}.".format(
-                        post_subreddit, enforce_moderators
-                    )
-                )
-            else:
-                # This is the default. Moderators will *not* have their
-                # posts flair enforced.
-                enforce_moderators = False
-
-            # If they are a mod and enforcement is not turned on for
-            # mods, don't do anything.
-            if flair_is_user_mod(post_author, post_subreddit) and not enforce_moderators:
+            # Artemis will not remove unflaired posts by mods, so if
+            # they are a mod and enforcement is not turned on for mods,
+            # don't do anything.
+            is_mod = flair_is_user_mod(post_author, post_subreddit, moderators_cache)
+            if is_mod and not enforce_moderators:
                 logger.info(
-                    "Get: > Post author u/{} is mod of r/{}. Skip.".format(
-                        post_author, post_subreddit
-                    )
+                    f"Get: > Post author u/{post_author} is mod of r/{post_subreddit}. Skip."
                 )
                 database.counter_updater(
-                    None, "Skipped mod post", "main", post_id=post_id, id_only=True
+                    None, "Skipped mod post", "main", post_id=post_id, id_only=True, commit=False
                 )
                 continue
 
             # Check to see if author is on a whitelist in extended data.
-            if "flair_enforce_whitelist" in sub_ext_data:
-                if post_author.lower() in sub_ext_data["flair_enforce_whitelist"]:
-                    logger.info("Get: > Post author u/{} is on the extended whitelist. Skipped.")
-                    database.counter_updater(
-                        None, "Skipped whitelist post", "main", post_id=post_id, id_only=True
-                    )
-                    continue
+            if post_author_lower in enforce_whitelist:
+                logger.info(
+                    f"Get: > Post author u/{post_author} is on the extended whitelist. Skipped."
+                )
+                database.counter_updater(
+                    None,
+                    "Skipped whitelist post",
+                    "main",
+                    post_id=post_id,
+                    id_only=True,
+                    commit=False,
+                )
+                continue
 
             # Retrieve the available flairs as a Markdown list.
             # This will be blank if there aren't actually any flairs.
-            available_templates = subreddit_templates_collater(post_subreddit, sub_ext_data)
-            main_msg = "Get: > Post on r/{} (https://redd.it/{}) is unflaired."
-            logger.info(main_msg.format(post_subreddit, post_id))
-
-            # Format the modmail link for the OP to message in case
-            # they have questions, and add a goodbye phrase.
-            moderator_mail_link = MSG_USER_FLAIR_MODMAIL_LINK.format(
-                post_subreddit, post_permalink
+            # The list is only generated once per subreddit per run.
+            if post_subreddit not in templates_cache:
+                templates_cache[post_subreddit] = subreddit_templates_collater(
+                    post_subreddit, sub_ext_data
+                )
+            available_templates = templates_cache[post_subreddit]
+            logger.info(
+                f"Get: > Post on r/{post_subreddit} (https://redd.it/{post_id}) is unflaired."
             )
-            bye_phrase = sub_ext_data.get("custom_goodbye", choice(GOODBYE_PHRASES)).lower()
-            if not bye_phrase:
-                bye_phrase = choice(GOODBYE_PHRASES).lower()
-
-            # Determine if we allow for flair selection via messaging.
-            if "flair" in current_permissions_list or "all" in current_permissions_list:
-                flair_option = MSG_USER_FLAIR_BODY_MESSAGING
-            else:
-                flair_option = ""
 
             # We are in strict enforcement mode, remove the post if we
             # have the permission to do so.
-            if "posts" in current_permissions_list or "all" in current_permissions_list:
+            if can_remove:
 
-                # Write the object to the filtered database.
-                flair_none_saver(post)
+                # Write the object to the filtered database. This is
+                # committed together with the other writes of this run
+                # rather than on its own.
+                flair_none_saver(post, commit=False)
 
                 # Remove the post. This is the only place a post can get
-                # removed by Artemis.
-                post.mod.remove()
-                removal = "Get: >> Also removed post `{}` and added to the filtered database."
-                logger.info(removal.format(post_id))
-                database.counter_updater(post_subreddit, "Removed post", "main", post_id=post_id)
+                # removed by Artemis. If the removal fails, take the
+                # post back out of the filtered database so that it is
+                # not later "restored" when it was never removed.
+                try:
+                    post.mod.remove()
+                except (praw.exceptions.APIException, prawcore.exceptions.Forbidden):
+                    database.delete_filtered_post(post_id, commit=False)
+                    logger.info(f"Get: >> Unable to remove post `{post_id}`. Skipped.")
+                    continue
+                logger.info(
+                    f"Get: >> Also removed post `{post_id}` and added to the filtered database."
+                )
+                database.counter_updater(
+                    None, "Removed post", "main", post_id=post_id, id_only=True, commit=False
+                )
+                actions_counter[(post_subreddit, "Removed post")] += 1
 
                 # Change the removal message depending on whether the
                 # extended data allows for removal.
-                auto_approve = sub_ext_data.get("flair_enforce_approve_posts", True)
                 if auto_approve:
                     removal_option = MSG_USER_FLAIR_REMOVAL
                 else:
@@ -2650,49 +2741,72 @@ def main_get_submissions(statistics_mode=False):
 
                 # Alert moderators who have opted in if necessary.
                 # Send the PRAW object and a list of users.
-                if "flair_enforce_alert_list" in sub_ext_data:
-                    if len(sub_ext_data["flair_enforce_alert_list"]) > 0:
-                        advanced_send_alert(post, sub_ext_data["flair_enforce_alert_list"])
+                if enforce_alert_list:
+                    alerts_queue.append((post, enforce_alert_list))
             else:
                 # Not in strict enforcement mode. Send a normal message.
                 database.counter_updater(
-                    post_subreddit, "Sent flair reminder", "main", post_id=post_id
+                    None,
+                    "Sent flair reminder",
+                    "main",
+                    post_id=post_id,
+                    id_only=True,
+                    commit=False,
                 )
+                actions_counter[(post_subreddit, "Sent flair reminder")] += 1
                 removal_option = ""
 
-            # Check to see if there's a custom message to send to the
-            # user from the extended configuration data.
-            if "flair_enforce_custom_message" in sub_ext_data:
-                custom_message = sub_ext_data["flair_enforce_custom_message"]
+            # Send the flair reminder message to the user, but we want
+            # to message only if there are actual flairs available and
+            # if the author is not deleted. The message is only put
+            # together if it is actually going to be sent.
+            if len(available_templates) != 0 and post_author != "[deleted]":
+
+                # Format the modmail link for the OP to message in case
+                # they have questions, and add a goodbye phrase. A
+                # random phrase is only chosen if there is no custom
+                # goodbye.
+                moderator_mail_link = MSG_USER_FLAIR_MODMAIL_LINK.format_map(
+                    {"subreddit": post_subreddit, "permalink": post_permalink}
+                )
+                if custom_goodbye:
+                    bye_phrase = custom_goodbye.lower()
+                else:
+                    bye_phrase = choice(GOODBYE_PHRASES_LOWER)
+
+                # Determine if we allow for flair selection via
+                # messaging.
+                if can_flair:
+                    flair_option = MSG_USER_FLAIR_BODY_MESSAGING
+                else:
+                    flair_option = ""
+
+                # Check to see if there's a custom message to send to
+                # the user from the extended configuration data.
+                custom_message = sub_ext_data.get("flair_enforce_custom_message")
                 if custom_message:
                     custom_text = "**Message from the moderators:** {}".format(custom_message)
                 else:
                     custom_text = ""
-            else:
-                custom_text = ""
-
-            # Format message to the user, using the list of templates.
-            # Tell OP that their post has been removed if that happened.
-            message_to_send = MSG_USER_FLAIR_BODY.format(
-                post_author,
-                post.subreddit.display_name,
-                available_templates,
-                post_permalink,
-                moderator_mail_link,
-                removal_option,
-                bye_phrase,
-                flair_option,
-                post.title,
-                custom_text,
-            )
 
-            # Send the flair reminder message to the user, but we want
-            # to message only if there are actual flairs available and
-            # if the author is not deleted.
-            if len(available_templates) != 0 and post_author != "[deleted]":
-                flair_notifier(post, message_to_send)
-                notify = "Get: >> Sent message to u/{} about unflaired post `{}`."
-                logger.info(notify.format(post_author, post_id))
+                # Format message to the user, using the list of
+                # templates. Tell OP that their post has been removed if
+                # that happened.
+                message_to_send = MSG_USER_FLAIR_BODY.format_map(
+                    {
+                        "username": post_author,
+                        "subreddit": post_subreddit_name,
+                        "templates": available_templates,
+                        "permalink": post_permalink,
+                        "modmail_link": moderator_mail_link,
+                        "removal": removal_option,
+                        "goodbye": bye_phrase,
+                        "flair_option": flair_option,
+                        "title": post_title_original,
+                        "custom_text": custom_text,
+                    }
+                )
+                notifications_queue.append((post, message_to_send))
 
         else:
             # Scheduling function to make sure posts match the schedule.
@@ -2713,15 +2827,15 @@ def main_get_submissions(statistics_mode=False):
                 # Check to make sure I have the proper permissions for
                 # this subreddit. Need to be able to remove posts.
                 # Otherwise, collect the mod permissions as a list.
-                current_permissions = connection.obtain_mod_permissions(post_subreddit, INSTANCE)
+                current_permissions = connection.obtain_mod_permissions(
+                    post_subreddit, INSTANCE, use_cache=True
+                )
                 if not current_permissions[0]:
                     continue
-                else:
-                    current_permissions_list = current_permissions[1]
 
                 # If we can process posts properly, check the flair
                 # template ID against the schedule.
-                if "posts" in current_permissions_list or "all" in current_permissions_list:
+                if set(current_permissions[1]) & {"posts", "all"}:
                     # Gather data about the schedule and check to see
                     # if the post flair is allowable on the schedule.
                     scheduling_dictionary = sub_ext_data["flair_schedule"]
@@ -2743,14 +2857,46 @@ def main_get_submissions(statistics_mode=False):
                     continue
 
             # This post has a flair. We don't need to process it.
-            logger.debug("Get: >> Post `{}` already has a flair. Doing nothing.".format(post_id))
+            already_flaired += 1
             continue
 
     # At the end, insert all the processed IDs into the database and
     # list the number of insertions into the `processed`
-    # database out of all the ones fetched.
-    database.CURSOR_MAIN.executemany("INSERT INTO posts_processed VALUES (?)", processed)
-    database.CONN_MAIN.commit()
+    # database out of all the ones fetched. Then record the tallied
+    # actions for each subreddit. The per-post writes made in the loop
+    # above were not committed individually, so they are all committed
+    # together with these when the block exits.
+    with database.CONN_MAIN:
+        database.CURSOR_MAIN.executemany(
+            "INSERT OR IGNORE INTO posts_processed VALUES (?)", processed
+        )
+        for (action_subreddit, action_type), action_count in actions_counter.items():
+            database.counter_updater(
+                action_subreddit, action_type, "main", action_count=action_count, commit=False
+            )
+
+    # Send out the queued messages. All removals have already been made
+    # by this point, so OPs are never told about a removal that has not
+    # happened yet. The posts are already marked as processed, so a
+    # connection problem with one send is logged and the rest are
+    # still sent, rather than abandoning the whole queue.
+    for post, message_to_send in notifications_queue:
+        try:
+            flair_notifier(post, message_to_send)
+        except connection.CONNECTION_EXCEPTIONS as e:
+            logger.error(
+                f"Get: >> Could not message u/{post.author} about unflaired post "
+                f"`{post.id}`: {e}"
+            )
+            continue
+        logger.info(f"Get: >> Sent message to u/{post.author} about unflaired post `{post.id}`.")
+    for post, alert_list in alerts_queue:
+        try:
+            advanced_send_alert(post, alert_list, moderators_cache)
+        except connection.CONNECTION_EXCEPTIONS as e:
+            logger.error(f"Get: >> Could not send removal alerts for post `{post.id}`: {e}")
+
+    logger.debug("Get: %s new posts already had a flair. Did nothing.", already_flaired)
     if processed:
         logger.info(
             "Get: Retrieval of {} new post IDs out of fetched {} posts into processed "
@@ -2760,6 +2906,29 @@ def main_get_submissions(statistics_mode=False):
     return
 
 
+def main_wait(seconds):
+    """This function waits in between isochronisms. Where the platform
+    supports it, the wait ends early if the process is sent `SIGUSR1`,
+    so that the next isochronism can be started from outside without
+    restarting Artemis. Otherwise it is a normal sleep.
+
+    :param seconds: The longest number of seconds to wait for.
+    :return: Nothing.
+    """
+    if seconds <= 0:
+        return
+
+    if hasattr(signal, "sigtimedwait"):
+        # `SIGUSR1` is blocked in `__main__`, so a signal sent while an
+        # isochronism is running stays pending and ends the next wait.
+        if signal.sigtimedwait([signal.SIGUSR1], seconds) is not None:
+            logger.info("Wait: Woken early by signal.")
+    else:
+        time.sleep(seconds)
+
+    return
+
+
 # This is the regular loop for Artemis, running main functions in
 # sequence while taking a `SETTINGS.wait` break in between.
 if __name__ == "__main__":
@@ -2781,8 +2950,14 @@ if __name__ == "__main__":
     else:
         USERNAME_REG = INFO.username
 
+    # Hold `SIGUSR1` for `main_wait` rather than letting it terminate.
+    if hasattr(signal, "sigtimedwait"):
+        signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGUSR1])
+
     try:
         while True:
+            wait_started = time.time()
+            wait_seconds = SETTINGS.wait
             try:
                 print(" ")
                 logger.info("------- Isochronism {:,} START.".format(ISOCHRONISMS))
@@ -2822,6 +2997,25 @@ if __name__ == "__main__":
             except SystemExit:
                 logger.info("Manual user shutdown via message.")
                 sys.exit()
+            except prawcore.exceptions.TooManyRequests as e:
+                # Reddit's rate limit was exceeded despite PRAW's own
+                # pacing. Hold off on the next isochronism for as long
+                # as Reddit asks, instead of treating this as an error.
+                # That period is counted from now rather than from the
+                # start of the isochronism.
+                wait_started = time.time()
+                try:
+                    wait_seconds = max(wait_seconds, int(e.response.headers["retry-after"]))
+                except (KeyError, ValueError):
+                    pass
+                logger.warning(
+                    "Rate limit exceeded. Waiting {} seconds until the next "
+                    "isochronism.".format(wait_seconds)
+                )
+            except connection.CONNECTION_EXCEPTIONS as e:
+                # A common connection issue with Reddit. Merely record
+                # it in the events log.
+                logger.error("\n### {} \n\n{}".format(e, traceback.format_exc()))
             except Exception as e:
                 # Artemis encountered an error/exception, and if the
                 # error is not a common connection issue, log it in a
@@ -2833,8 +3027,12 @@ if __name__ == "__main__":
                 if not any(keyword in error_entry for keyword in SETTINGS.conn_errors):
                     main_error_log(error_entry)
 
+            # Only sleep for whatever is left of the wait interval, so
+            # that the time spent on the isochronism itself counts
+            # towards it. A slow isochronism is followed immediately by
+            # the next one rather than adding a full wait on top.
             ISOCHRONISMS += 1
-            time.sleep(SETTINGS.wait)
+            main_wait(wait_seconds - (time.time() - wait_started))
     except KeyboardInterrupt:
         # Manual termination of the script with Ctrl-C.
         logger.info("Manual user shutdown via keyboard.")
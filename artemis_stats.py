@@ -4,14 +4,16 @@
 which is run daily after midnight UTC.
 """
 import datetime
+import heapq
+import json
 import os
 import re
 import sys
 import time
 import traceback
 from ast import literal_eval
-from calendar import monthrange
-from collections import Counter, OrderedDict
+from collections import Counter
+from functools import wraps
 from random import sample
 from threading import Thread
 from urllib.error import HTTPError, URLError
@@ -21,7 +23,9 @@ import praw
 import prawcore
 import psutil
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError
+from urllib3.util.retry import Retry
 
 import connection
 import database
@@ -34,6 +38,61 @@ from text import *
 # Number of regular top-level routine runs that have been made.
 CYCLES = 0
 AGGS_ENABLED = True
+# A shared HTTP session for Pushshift, so that its connection is kept
+# open and reused across queries instead of being set up for each one.
+# Rate limits and server errors are retried with a short backoff.
+PUSHSHIFT_SESSION = requests.Session()
+PUSHSHIFT_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        ),
+    ),
+)
+# Cache of the results for time periods that have already ended, indexed
+# by a tuple of (function name, arguments) with a tuple of (time stored,
+# result). Entries are kept for a little over a day so that the next
+# daily statistics run can reuse them.
+CLOSED_PERIOD_CACHE = {}
+CLOSED_PERIOD_CACHE_SECONDS = 90000
+
+
+def closed_period_cache(function):
+    """A decorator that memoizes a function which takes a subreddit
+    name, a start date, and an end date (both as YYYY-MM-DD strings).
+    Only periods which ended before today in UTC are cached, since
+    their data will not change afterwards. Empty results are never
+    cached.
+
+    :param function: The function to wrap.
+    :return: The wrapped function.
+    """
+
+    @wraps(function)
+    def wrapper(subreddit_name, start_date, end_date, *args):
+        current_time = time.time()
+        if end_date >= timekeeping.convert_to_string(current_time):
+            return function(subreddit_name, start_date, end_date, *args)
+
+        cache_key = (function.__name__, subreddit_name.lower(), start_date, end_date) + args
+        if cache_key in CLOSED_PERIOD_CACHE:
+            cached_time, cached_result = CLOSED_PERIOD_CACHE[cache_key]
+            if current_time - cached_time < CLOSED_PERIOD_CACHE_SECONDS:
+                return cached_result
+
+        result = function(subreddit_name, start_date, end_date, *args)
+        if result is not None:
+            CLOSED_PERIOD_CACHE[cache_key] = (current_time, result)
+
+        return result
+
+    return wrapper
 
 
 """SUBREDDIT TRAFFIC RETRIEVAL"""
@@ -47,13 +106,14 @@ def subreddit_traffic_daily_estimator(subreddit_name):
     :return: A dictionary indexed with various values, including
              averages and estimated totals. `None` if inaccessible.
     """
-    daily_traffic_dictionary = {}
     output_dictionary = {}
     total_uniques = []
     total_pageviews = []
 
-    # Get the current month as a YYYY-MM string.
+    # Get the current month as a YYYY-MM string, the number of days in
+    # it, and the Unix times at which it starts and ends in UTC.
     current_month = timekeeping.month_convert_to_string(time.time())
+    days_in_month, month_start, month_end = timekeeping.month_boundaries(current_month)
 
     # Retrieve traffic data as a dictionary.
     # The speed of this function is determined by how fast `traffic()`
@@ -66,31 +126,24 @@ def subreddit_traffic_daily_estimator(subreddit_name):
         return None
     daily_data = traffic_data["day"]
 
-    # Iterate over the data. If there's data for a day, we'll save it.
+    # Iterate over the data. If there's data for a day this month,
+    # we'll save its uniques and pageviews.
     for date in daily_data:
-        date_string = timekeeping.time_convert_to_string(date[0])
         date_uniques = date[1]
-        if date_uniques != 0 and current_month in date_string:
-            date_pageviews = date[2]
-            daily_traffic_dictionary[date_string] = [date_uniques, date_pageviews]
+        if date_uniques != 0 and month_start <= date[0] < month_end:
+            total_uniques.append(date_uniques)
+            total_pageviews.append(date[2])
 
     # Evaluate our data.
-    num_of_recorded_days = len(daily_traffic_dictionary.keys())
-    if num_of_recorded_days == 0:
+    days_uniques_recorded = len(total_uniques)
+    if days_uniques_recorded == 0:
         return None  # Exit if we have no valid data.
-    for date, value in daily_traffic_dictionary.items():
-        total_uniques.append(value[0])
-        total_pageviews.append(value[1])
 
     # Calculate the daily average of uniques and page views.
-    days_uniques_recorded = len(total_uniques)
     average_uniques = int(sum(total_uniques) / days_uniques_recorded)
-    average_pageviews = int(sum(total_pageviews) / len(total_pageviews))
+    average_pageviews = int(sum(total_pageviews) / days_uniques_recorded)
 
-    # Get the number of days in the month and calculate the estimated
-    # amount for the month.
-    year = datetime.datetime.now().year
-    days_in_month = monthrange(year, datetime.datetime.now().month)[1]
+    # Calculate the estimated amount for the month.
     output_dictionary["average_uniques"] = average_uniques
     output_dictionary["average_pageviews"] = average_pageviews
     output_dictionary["estimated_pageviews"] = average_pageviews * days_in_month
@@ -108,12 +161,15 @@ def subreddit_traffic_daily_estimator(subreddit_name):
     return output_dictionary
 
 
-def subreddit_traffic_recorder(subreddit_name):
+def subreddit_traffic_recorder(subreddit_name, commit=True):
     """Retrieve the recorded monthly traffic statistics for a subreddit
     and store them in our database. This function will also merge or
     retrieve it from the local cache if that data is already stored.
 
     :param subreddit_name: The name of a Reddit subreddit.
+    :param commit: Whether to commit the data right away. The daily
+                   statistics loop passes `False` and commits once
+                   per subreddit instead.
     :return: A dictionary indexed by YYYY-MM with the traffic data for
              that month.
     """
@@ -149,27 +205,20 @@ def subreddit_traffic_recorder(subreddit_name):
         if current_month != year_month and month_uniques > 0 and month_pageviews > 0:
             traffic_dictionary[year_month] = [month_uniques, month_pageviews]
 
-    # Check for pre-existing traffic data stored in the database.
-    sql_command = "SELECT * FROM subreddit_traffic WHERE subreddit = ?"
-    database.CURSOR_STATS.execute(sql_command, (subreddit_name,))
-    result = database.CURSOR_STATS.fetchone()
-
     # If the data has not been saved before, add it as a new entry.
     # Otherwise, if saved traffic data already exists merge the data.
-    if result is None:
-        data_package = (subreddit_name, str(traffic_dictionary))
-        database.CURSOR_STATS.execute("INSERT INTO subreddit_traffic VALUES (?, ?)", data_package)
-        database.CONN_STATS.commit()
-        logger.debug("Traffic Recorder: Traffic data for r/{} added.".format(subreddit_name))
-    else:
-        existing_dictionary = literal_eval(result[1])
-        new_dictionary = existing_dictionary.copy()
-        new_dictionary.update(traffic_dictionary)
+    # The merge is done by SQLite's `json_patch`, which works like
+    # `dict.update()`, so the existing data need not be read first.
+    upsert_command = (
+        "INSERT INTO subreddit_traffic VALUES (?, ?) ON CONFLICT (subreddit) "
+        "DO UPDATE SET traffic = json_patch(traffic, excluded.traffic)"
+    )
+    data_package = (subreddit_name, json.dumps(traffic_dictionary))
+    database.CURSOR_STATS.execute(upsert_command, data_package)
+    logger.debug("Traffic Recorder: Traffic data for r/{} saved.".format(subreddit_name))
 
-        update_command = "UPDATE subreddit_traffic SET traffic = ? WHERE subreddit = ?"
-        database.CURSOR_STATS.execute(update_command, (str(new_dictionary), subreddit_name))
+    if commit:
         database.CONN_STATS.commit()
-        logger.debug("Traffic Recorder: r/{} data merged.".format(subreddit_name))
 
     return traffic_dictionary
 
@@ -190,7 +239,6 @@ def subreddit_traffic_retriever(subreddit_name):
     :param subreddit_name: The name of a Reddit subreddit.
     :return: A Markdown table with all the months we have data for.
     """
-    correlated_data = {}
     formatted_lines = []
     all_uniques = []
     all_pageviews = []
@@ -198,7 +246,6 @@ def subreddit_traffic_retriever(subreddit_name):
     all_pageviews_changes = []
     top_month_uniques = None
     top_month_pageviews = None
-    basic_line = "| {} | {} | {:,} | *{}%* | {} | {:,} | *{}%* | {} |"
 
     # Look for the traffic data in our database.
     subreddit_name = subreddit_name.lower()
@@ -210,38 +257,12 @@ def subreddit_traffic_retriever(subreddit_name):
     # If we have data, convert it back into a dictionary.
     # Otherwise, return `None.
     if results is not None:
-        traffic_dictionary = literal_eval(results[1])
+        traffic_dictionary = json.loads(results[1])
         if not len(traffic_dictionary):  # Empty dictionary.
             return None
     else:
         return None
 
-    # Fetch some submission / comment data from Pushshift's database
-    # for integration into the overall traffic table.
-    for search_type in ["submission", "comment"]:
-        correlated_data[search_type] = {}
-        earliest_month = list(traffic_dictionary.keys())[0] + "-01"
-        stat_query = (
-            "https://api.pushshift.io/reddit/search/{}/?subreddit={}&after={}"
-            "&aggs=created_utc&frequency=month&size=0".format(
-                search_type, subreddit_name, earliest_month
-            )
-        )
-        retrieved_data = subreddit_pushshift_access(stat_query)
-        if "aggs" not in retrieved_data:
-            correlated_data[search_type] = {}
-        else:
-            returned_months = retrieved_data["aggs"]["created_utc"]
-
-            for entry in returned_months:
-                month = timekeeping.month_convert_to_string(entry["key"])
-                count = entry["doc_count"]
-                if not count:
-                    formatted_count = "N/A"
-                else:
-                    formatted_count = "{:,}".format(count)
-                correlated_data[search_type][month] = formatted_count
-
     # Iterate over our dictionary.
     for key in sorted(traffic_dictionary, reverse=True):
 
@@ -307,29 +328,19 @@ def subreddit_traffic_retriever(subreddit_name):
             pageviews_symbol = ""
 
         # Format the table line and add it to the list.
-        line = basic_line.format(
-            key,
-            uniques_symbol,
-            current_uniques,
-            uniques_change,
-            pageviews_symbol,
-            current_pageviews,
-            pageviews_change,
-            ratio_uniques_pageviews,
-            # correlated_data["submission"].get(key, "N/A"),
-            # correlated_data["comment"].get(key, "N/A"),
+        line = (
+            f"| {key} | {uniques_symbol} | {current_uniques:,} | *{uniques_change}%* | "
+            f"{pageviews_symbol} | {current_pageviews:,} | *{pageviews_change}%* | "
+            f"{ratio_uniques_pageviews} |"
         )
         formatted_lines.append(line)
 
     # Here we look for the top months we have in the recorded data.
     if len(all_uniques) != 0 and len(all_pageviews) != 0:
-        top_uniques = max(all_uniques)
-        top_pageviews = max(all_pageviews)
-        for key, data in traffic_dictionary.items():
-            if top_uniques in data:
-                top_month_uniques = key
-            if top_pageviews in data:
-                top_month_pageviews = key
+        top_month_uniques = max(traffic_dictionary, key=lambda x: traffic_dictionary[x][0])
+        top_month_pageviews = max(traffic_dictionary, key=lambda x: traffic_dictionary[x][1])
+        top_uniques = traffic_dictionary[top_month_uniques][0]
+        top_pageviews = traffic_dictionary[top_month_pageviews][1]
     else:
         top_uniques = top_pageviews = None
 
@@ -359,38 +370,13 @@ def subreddit_traffic_retriever(subreddit_name):
             est_pageviews_change = round((pageviews_diff / previous_pageviews) * 100, 2)
             ratio_raw = round(estimated_pageviews / estimated_uniques, 0)
             ratio_est_uniques_pageviews = "≈1:{}".format(int(ratio_raw))
-            x_ratio = 1 + (est_pageviews_change * 0.01)  # Est. ratio
-
-            # Interpolate estimated number of posts and comments based
-            # on the Pushshift data and the ratio we have for pageviews.
-            now_posts = correlated_data["submission"].get(prev_month, "0").replace(",", "")
-            if now_posts != "N/A":
-                now_posts = int(now_posts)
-                est_posts = "{:,.0f}".format(now_posts * x_ratio)
-            else:
-                est_posts = "N/A"
-
-            now_comments = correlated_data["comment"].get(prev_month, "0").replace(",", "")
-            if now_comments != "N/A":
-                now_comments = int(now_comments)
-                est_comments = "{:,.0f}".format(now_comments * x_ratio)
-            else:
-                est_comments = "N/A"
         except (KeyError, ZeroDivisionError):
             est_uniques_change = est_pageviews_change = ratio_est_uniques_pageviews = "---"
-            est_posts = est_comments = "N/A"
-
-        estimated_line = basic_line.format(
-            "*{} (estimated)*".format(current_month),
-            "",
-            estimated_uniques,
-            est_uniques_change,
-            "",
-            estimated_pageviews,
-            est_pageviews_change,
-            ratio_est_uniques_pageviews,
-            est_posts,
-            est_comments,
+
+        estimated_line = (
+            f"| *{current_month} (estimated)* |  | {estimated_uniques:,} | "
+            f"*{est_uniques_change}%* |  | {estimated_pageviews:,} | "
+            f"*{est_pageviews_change}%* | {ratio_est_uniques_pageviews} |"
         )
 
         # Insert at the start of the formatted lines list, position 0.
@@ -398,18 +384,20 @@ def subreddit_traffic_retriever(subreddit_name):
 
     # Get the averages of both the total amounts and the percentages.
     # If there's no data, set the averages to zero.
-    try:
-        num_avg_uniques = round(sum(all_uniques) / len(all_uniques), 2)
-        num_avg_pageviews = round(sum(all_pageviews) / len(all_uniques), 2)
-    except ZeroDivisionError:
+    num_months = len(all_uniques)
+    if num_months:
+        num_avg_uniques = round(sum(all_uniques) / num_months, 2)
+        num_avg_pageviews = round(sum(all_pageviews) / num_months, 2)
+    else:
         num_avg_uniques = num_avg_pageviews = 0
 
     # Make sure we have month over month data, because if we don't have
     # more than one month's worth of data, we can't calculate the
     # average per month increase.
-    if len(all_uniques_changes) > 0 and len(all_pageviews_changes) > 0:
-        num_avg_uniques_change = round(sum(all_uniques_changes) / len(all_uniques_changes), 2)
-        num_pageviews_changes = round(sum(all_pageviews_changes) / len(all_pageviews_changes), 2)
+    num_changes = len(all_uniques_changes)
+    if num_changes:
+        num_avg_uniques_change = round(sum(all_uniques_changes) / num_changes, 2)
+        num_pageviews_changes = round(sum(all_pageviews_changes) / num_changes, 2)
     else:
         num_avg_uniques_change = num_pageviews_changes = 0
 
@@ -552,7 +540,7 @@ def subreddit_pushshift_access(query_string, retries=3, stream_possible=False):
     # Regular function iteration.
     for _ in range(retries):
         try:
-            returned_data = requests.get(query_string)
+            returned_data = PUSHSHIFT_SESSION.get(query_string)
             returned_data = returned_data.json()
             return returned_data  # Return data as soon as it is found.
         except (ValueError, ConnectionError, HTTPError, requests.exceptions.ChunkedEncodingError):
@@ -561,7 +549,9 @@ def subreddit_pushshift_access(query_string, retries=3, stream_possible=False):
     return {}
 
 
-def subreddit_subscribers_recorder(subreddit_name, check_pushshift=False):
+def subreddit_subscribers_recorder(
+    subreddit_name, check_pushshift=False, commit=True, known_subscribers=None
+):
     """A quick routine that gets the number of subscribers for a
     specific subreddit and saves it to our database.
     This is intended to be run daily at midnight UTC.
@@ -574,6 +564,10 @@ def subreddit_subscribers_recorder(subreddit_name, check_pushshift=False):
                             may have been added at the end of a UTC day
                             and its current subscriber count would not
                             be as accurate as an earlier one.
+    :param commit: Whether to commit the data right away.
+    :param known_subscribers: The subscriber count if it has already
+                              been fetched, such as in a batch. If
+                              `None` it will be fetched from Reddit.
     :return: Nothing.
     """
     # Get the date by converting the time to YYYY-MM-DD in UTC.
@@ -584,7 +578,9 @@ def subreddit_subscribers_recorder(subreddit_name, check_pushshift=False):
     # start of the day. Set `current_subs` to `None` if there is no
     # information retrieved. If we can get data, it'll be in a dict
     # format: {'2018-11-11': 9999}
-    if check_pushshift:
+    if known_subscribers is not None:
+        current_subs = known_subscribers
+    elif check_pushshift:
         ps_subscribers = subreddit_subscribers_pushshift_historical_recorder(
             subreddit_name, fetch_today=True
         )
@@ -610,7 +606,7 @@ def subreddit_subscribers_recorder(subreddit_name, check_pushshift=False):
             current_day, subreddit_name, current_subs
         )
     )
-    database.subscribers_insert(subreddit_name, data_package)
+    database.subscribers_insert(subreddit_name, data_package, commit)
 
     return
 
@@ -626,7 +622,8 @@ def subreddit_subscribers_retriever(subreddit_name):
              subscribers and total number.
     """
     formatted_lines = []
-    day_changes = []
+    changes_sum = 0
+    changes_count = 0
 
     # Check to see if this has been stored before.
     # If there is, get the dictionary. Exit if there is no data.
@@ -650,28 +647,30 @@ def subreddit_subscribers_retriever(subreddit_name):
             founding_date = "1970-01-01"
 
     # Iterate over the data. Format the lines together and get their net
-    # change as well. We sort in this case, by newest first.
-    list_of_dates = list(sorted(subscriber_dictionary.keys()))
-    list_of_dates.reverse()
-    for date in list_of_dates:
-        day_index = list_of_dates.index(date)
+    # change as well. We sort in this case, by newest first, so the
+    # entry for the previous day, if it exists, is always the next one
+    # along. Days are compared as ordinals so no date strings need to be
+    # formatted in the loop.
+    list_of_dates = sorted(subscriber_dictionary.keys(), reverse=True)
+    day_ordinals = [datetime.date.fromisoformat(date).toordinal() for date in list_of_dates]
+    line = "| {} | {:,} | {:+,} |"
+    day_limit = SETTINGS.num_display_subscriber_days
+    for day_index, date in enumerate(list_of_dates):
         logger.debug(
-            "Subscribers Retriever for r/{}: {}, index {}".format(subreddit_name, date, day_index)
+            "Subscribers Retriever for r/%s: %s, index %s", subreddit_name, date, day_index
         )
-
-        # Get some date variables and the template for each line.
-        day_t = datetime.datetime.strptime(date, "%Y-%m-%d").date()
-        previous_day = day_t + datetime.timedelta(-1)
-        previous_day = str(previous_day.strftime("%Y-%m-%d"))
-        line = "| {} | {:,} | {:+,} |"
         subscriber_count = subscriber_dictionary[date]
+        previous_index = day_index + 1
+        has_previous_day = (
+            previous_index < len(list_of_dates)
+            and day_ordinals[previous_index] == day_ordinals[day_index] - 1
+        )
 
         # This is a regular day in the last 180 entries. If we are past
         # 180 days (about half a year) then we get only the starts of
         # the months for a shorter table.
-        day_limit = SETTINGS.num_display_subscriber_days
-        if previous_day in subscriber_dictionary and day_index <= day_limit:
-            subscriber_previous = subscriber_dictionary[previous_day]
+        if has_previous_day and day_index <= day_limit:
+            subscriber_previous = subscriber_dictionary[list_of_dates[previous_index]]
             net_change = subscriber_count - subscriber_previous
         elif day_index > day_limit and "-01" in date[-3:]:
             # Try to get the previous month's entry, which is not
@@ -694,18 +693,19 @@ def subreddit_subscribers_retriever(subreddit_name):
         else:
             continue
 
-        # If there was a change, append the change to our list.
+        # If there was a change, add it to our running total.
         if net_change != 0:
-            day_changes.append(net_change)
+            changes_sum += net_change
+            changes_count += 1
 
         new_line = line.format(date, subscriber_count, net_change)
         if day_index <= day_limit or day_index > day_limit and "-01" in date[-3:]:
             formatted_lines.append(new_line)
 
     # Get the average change of subscribers per day.
-    if len(day_changes) >= 2:
+    if changes_count >= 2:
 
-        average_change = sum(day_changes) / len(day_changes)
+        average_change = changes_sum / changes_count
         average_change_text = "*Average Daily Change (overall)*: {:+,.2f} subscribers\n\n"
         average_change_section = average_change_text.format(average_change)
 
@@ -762,7 +762,7 @@ def subreddit_subscribers_estimator(subreddit_name):
     # `sample_size`. In this case it means we look through the last two
     # weeks to get the average. We order the data from newest first to
     # oldest last.
-    last_few_days = list(sorted(results.keys()))[-sample_size:]
+    last_few_days = sorted(results)[-sample_size:]
     last_few_days.reverse()
     for day in last_few_days:
         last_few_entries.append(results[day])
@@ -857,23 +857,24 @@ def subreddit_subscribers_milestone_chart_former(subreddit_name):
         return None
 
     # Get the last number of recorded subscribers.
-    current_subscribers = dictionary_total[list(sorted(dictionary_total.keys()))[-1]]
+    current_subscribers = dictionary_total[max(dictionary_total)]
     milestones_to_check = [x for x in SETTINGS.milestones if x <= current_subscribers]
 
     # We iterate over the data we have, starting with the OLDEST date
     # we have data for.
-    for date in list(sorted(dictionary_total.keys())):
+    for date in sorted(dictionary_total):
         date_subscribers = dictionary_total[date]
+        next_day = None
 
         # Iterate over the subscriber milestones that we have defined.
         for milestone in milestones_to_check:
             if date_subscribers > milestone:
                 continue
             else:
-                # We get the next day for the milestone.
-                d_type = "%Y-%m-%d"
-                time_delta = datetime.timedelta(days=1)
-                next_day = (datetime.datetime.strptime(date, d_type) + time_delta).strftime(d_type)
+                # We get the next day for the milestone, once per date.
+                if next_day is None:
+                    next_day = datetime.date.fromisoformat(date) + datetime.timedelta(days=1)
+                    next_day = next_day.isoformat()
 
                 # We add the next date here.
                 dictionary_milestones[milestone] = next_day
@@ -896,7 +897,7 @@ def subreddit_subscribers_milestone_chart_former(subreddit_name):
     founding_date = timekeeping.convert_to_string(reddit.subreddit(subreddit_name).created_utc)
     founding_line = "\n| {} | Created | --- |\n\n".format(founding_date)
 
-    for milestone, date in list(sorted(dictionary_milestones.items())):
+    for milestone, date in sorted(dictionary_milestones.items()):
 
         # If we have previous items in this list, we want to calculate
         # the daily growth between this milestone and the previous one.
@@ -1161,11 +1162,12 @@ def subreddit_subscribers_redditmetrics_historical_recorder(subreddit_name, fetc
     return
 
 
-def subreddit_pushshift_oldest_retriever(subreddit_name):
+def subreddit_pushshift_oldest_retriever(subreddit_name, commit=True):
     """This function uses Pushshift to retrieve the oldest posts on a
     subreddit and formats it as a Markdown list.
 
     :param subreddit_name: The community we are looking for.
+    :param commit: Whether to commit the data right away.
     :return: A Markdown text paragraph containing the oldest posts as
              links in a bulleted list.
     """
@@ -1234,7 +1236,7 @@ def subreddit_pushshift_oldest_retriever(subreddit_name):
     # Save it to the database if there isn't a previous record of it and
     # if we have data.
     if result is None and len(oldest_data) != 0 and len(oldest_data) >= SETTINGS.num_display:
-        database.activity_insert(subreddit_name, "oldest", "oldest", oldest_data)
+        database.activity_insert(subreddit_name, "oldest", "oldest", oldest_data, commit)
 
     return oldest_section
 
@@ -1344,7 +1346,7 @@ def subreddit_pushshift_time_top_retriever(
     return final_dictionary
 
 
-def subreddit_top_collater(subreddit_name, month_string, last_month_mode=False):
+def subreddit_top_collater(subreddit_name, month_string, last_month_mode=False, commit=True):
     """This function takes a dictionary formed by the earlier function
     and forms a Markdown bulleted list with the top posts from a
     specific month.
@@ -1356,13 +1358,13 @@ def subreddit_top_collater(subreddit_name, month_string, last_month_mode=False):
     :param month_string: A month expressed as YYYY-MM.
     :param last_month_mode: A boolean indicating whether we want the
                             actual top X posts directly from PRAW.
+    :param commit: Whether to commit the data right away.
     :return: A Markdown bulleted list.
     """
     # Set date variables.
-    year = int(month_string.split("-")[0])
-    month = int(month_string.split("-")[1])
+    days_in_month = timekeeping.month_boundaries(month_string)[0]
     first_day = "{}-01".format(month_string)
-    last_day = "{}-{}".format(month_string, monthrange(year, month)[1])
+    last_day = "{}-{}".format(month_string, days_in_month)
 
     # Get the current month. We don't want to save the data if it is in
     # the current month, which is not over.
@@ -1424,7 +1426,7 @@ def subreddit_top_collater(subreddit_name, month_string, last_month_mode=False):
 
         # Store the dictionary data to our database.
         database.activity_insert(
-            subreddit_name, month_string, "popular_submission", dictionary_data
+            subreddit_name, month_string, "popular_submission", dictionary_data, commit
         )
 
     # Put it all together as a formatted chunk of text.
@@ -1433,7 +1435,9 @@ def subreddit_top_collater(subreddit_name, month_string, last_month_mode=False):
     return body
 
 
-def subreddit_pushshift_time_authors_retriever(subreddit_name, start_time, end_time, search_type):
+def subreddit_pushshift_time_authors_retriever(
+    subreddit_name, start_time, end_time, search_type, commit=True
+):
     """This function accesses Pushshift to retrieve the top FREQUENT
     submitters/commenters on a subreddit for a given timespan. It also
     formats the data as a bulleted Markdown list. Though this can
@@ -1445,6 +1449,7 @@ def subreddit_pushshift_time_authors_retriever(subreddit_name, start_time, end_t
     :param end_time: We want to find posts *before* this time.
     :param search_type: `comment` or `submission`, depending on the
                         type of top results one wants.
+    :param commit: Whether to commit the data right away.
     :return: A Markdown list with a header and bulleted list for each
              submitter/commenter.
     """
@@ -1458,12 +1463,14 @@ def subreddit_pushshift_time_authors_retriever(subreddit_name, start_time, end_t
     # Check the database first.
     authors_data = database.activity_retrieve(subreddit_name, specific_month, activity_index)
 
-    # If we don't have local data, fetch it.
+    # If we don't have local data, fetch it. Only the aggregations are
+    # used, so the posts returned alongside them are limited to their
+    # IDs to keep the response small.
     if authors_data is None:
         authors_data = {}
         api_search_query = (
             "https://api.pushshift.io/reddit/search/{}/?subreddit={}"
-            "&sort_type=score&sort=desc&after={}&before={}&aggs=author&size=50"
+            "&sort_type=score&sort=desc&after={}&before={}&aggs=author&size=50&fields=id"
         )
 
         # Get the data from Pushshift as a dictionary.
@@ -1509,7 +1516,9 @@ def subreddit_pushshift_time_authors_retriever(subreddit_name, start_time, end_t
 
         # Write to the database if we are not in the current month.
         if specific_month != current_month:
-            database.activity_insert(subreddit_name, specific_month, activity_index, authors_data)
+            database.activity_insert(
+                subreddit_name, specific_month, activity_index, authors_data, commit
+            )
 
     # Get the data formatted.
     formatted_data = subreddit_pushshift_time_authors_collater(authors_data, search_type)
@@ -1555,7 +1564,9 @@ def subreddit_pushshift_time_authors_collater(input_dictionary, search_type):
     return body
 
 
-def subreddit_pushshift_activity_retriever(subreddit_name, start_time, end_time, search_type):
+def subreddit_pushshift_activity_retriever(
+    subreddit_name, start_time, end_time, search_type, commit=True
+):
     """This function accesses Pushshift to retrieve the activity,
     including MOST submissions or comments, on a subreddit for a given
     timespan. It also formats it as a bulleted Markdown list.
@@ -1569,6 +1580,7 @@ def subreddit_pushshift_activity_retriever(subreddit_name, start_time, end_time,
                      expressed in string form.
     :param search_type: `comment` or `submission`, depending on the type
                         of top results one wants.
+    :param commit: Whether to commit the data right away.
     :return: A Markdown list with a header and bulleted list for each
              most active day.
     """
@@ -1585,13 +1597,15 @@ def subreddit_pushshift_activity_retriever(subreddit_name, start_time, end_time,
     # Check the database first.
     days_data = database.activity_retrieve(subreddit_name, specific_month, activity_index)
 
-    # If we don't have local data, fetch it.
+    # If we don't have local data, fetch it. Only the aggregations are
+    # used, so the posts returned alongside them are limited to their
+    # IDs to keep the response small.
     if days_data is None:
         days_data = {}
 
         api_search_query = (
             "https://api.pushshift.io/reddit/search/{}/?subreddit={}"
-            "&sort_type=created_utc&after={}&before={}&aggs=created_utc&size=50"
+            "&sort_type=created_utc&after={}&before={}&aggs=created_utc&size=50&fields=id"
         )
 
         # Get the data from Pushshift as a dictionary.
@@ -1619,7 +1633,9 @@ def subreddit_pushshift_activity_retriever(subreddit_name, start_time, end_time,
 
         # Write to the database if we are not in the current month.
         if specific_month != current_month:
-            database.activity_insert(subreddit_name, specific_month, activity_index, days_data)
+            database.activity_insert(
+                subreddit_name, specific_month, activity_index, days_data, commit
+            )
 
     # Get the data formatted.
     formatted_data = subreddit_pushshift_activity_collater(days_data, search_type)
@@ -1636,7 +1652,6 @@ def subreddit_pushshift_activity_collater(input_dictionary, search_type):
     :param search_type: Either `submission` or `comment`.
     :return: A Markdown segment.
     """
-    days_highest = []
     lines_to_post = []
     unavailable = "* It appears that there were no {}s during this period.".format(search_type)
     # Define the number of days stored in the dictionary.
@@ -1653,13 +1668,11 @@ def subreddit_pushshift_activity_collater(input_dictionary, search_type):
     else:
         average_line = str(unavailable)
 
-    # Find the busiest days and add those days to a list with the date.
-    most_posts = sorted(zip(input_dictionary.values()), reverse=True)[: SETTINGS.num_display]
-    for number in most_posts:
-        for date, count in input_dictionary.items():
-            if number[0] == count and date not in str(days_highest):  # Get the unique date.
-                days_highest.append([date, number[0]])
-                break
+    # Find the busiest days as a list of (date, count) tuples. Days with
+    # the same count keep their original order.
+    days_highest = heapq.nlargest(
+        SETTINGS.num_display, input_dictionary.items(), key=lambda item: item[1]
+    )
 
     # Format the individual lines.
     for day in days_highest:
@@ -1678,13 +1691,14 @@ def subreddit_pushshift_activity_collater(input_dictionary, search_type):
     return body
 
 
-def subreddit_stream_post_information(subreddit_name, start_time, end_time):
+def subreddit_stream_post_information(subreddit_name, start_time, end_time, commit=True):
     """This function looks at Stream data and gathers some supplementary
     "aggregation" information on the kinds of posts.
 
     :param subreddit_name: The community we are looking for.
     :param start_time: We want to find posts *after* this time.
     :param end_time: We want to find posts *before* this time.
+    :param commit: Whether to commit the data right away.
     :return: A Markdown list with a header and bulleted list for each
              requested attribute.
     """
@@ -1716,7 +1730,9 @@ def subreddit_stream_post_information(subreddit_name, start_time, end_time):
 
             # Write to the database if we are not in the current month.
             if specific_month != current_month:
-                database.activity_insert(subreddit_name, specific_month, query, dict(results))
+                database.activity_insert(
+                    subreddit_name, specific_month, query, dict(results), commit
+                )
         else:
             # We have local data. Load it from the database.
             logger.debug(f"Stream Post Information: Loading `{query}` data from database.")
@@ -1790,9 +1806,7 @@ def subreddit_statistics_recorder(subreddit_name, start_time, end_time):
              This dictionary will be empty if there were no posts
              recorded during this period.
     """
-    statistics_dictionary = {}
-    all_flairs = []
-    no_flair_count = 0
+    statistics_dictionary = Counter()
 
     # This is a counter of older posts that have been encountered.
     # The loop breaks if a certain amount exceeds (10) which then
@@ -1832,31 +1846,15 @@ def subreddit_statistics_recorder(subreddit_name, start_time, end_time):
                 break
 
         # Once time parameters are taken care of, we can process our
-        # results.
-        result_text = result.link_flair_text
-
-        # Get the submission and add its flair to a list. If there is no
-        # flair text, add one to the count.
-        if result_text is not None:
-            all_flairs.append(result_text)
-        else:
-            no_flair_count += 1
+        # results. Count the submission under its flair text. Posts
+        # that do not have flair are indexed by the *string* "None",
+        # but not the value `None`.
+        statistics_dictionary[str(result.link_flair_text)] += 1
 
-    # Get an alphabetized list of the flairs we have, and for each flair
-    # get the number of posts with the post flair.
-    alphabetized_list = list(set(all_flairs))
-    for flair in alphabetized_list:
-        statistics_dictionary[flair] = all_flairs.count(flair)
+    return dict(statistics_dictionary)
 
-    # Add the ones that do not have flair. Note that we index it by its
-    # *string* "None", but not the value `None`.
-    if no_flair_count > 0:
-        statistics_dictionary["None"] = no_flair_count
 
-    return statistics_dictionary
-
-
-def subreddit_statistics_recorder_daily(subreddit, date_string):
+def subreddit_statistics_recorder_daily(subreddit, date_string, commit=True):
     """This is a function that checks the database for
     `subreddit_statistics_recorder` data. It merges it if it finds data
     already, otherwise it adds the day's statistics as a new daily
@@ -1866,6 +1864,7 @@ def subreddit_statistics_recorder_daily(subreddit, date_string):
 
     :param subreddit: The subreddit we're checking for.
     :param date_string: A date string in the model of YYYY-MM-DD.
+    :param commit: Whether to commit the data right away.
     :return:
     """
     to_store = True
@@ -1890,7 +1889,7 @@ def subreddit_statistics_recorder_daily(subreddit, date_string):
     # the date string.
     if to_store:
         day_data = {date_string: subreddit_statistics_recorder(subreddit, day_start, day_end)}
-        database.statistics_posts_insert(subreddit, day_data)
+        database.statistics_posts_insert(subreddit, day_data, commit)
         logger.debug(
             "Stat Recorder Daily: Stored statistics for r/{} for {}.".format(
                 subreddit, date_string
@@ -1905,6 +1904,7 @@ def subreddit_statistics_recorder_daily(subreddit, date_string):
     return
 
 
+@closed_period_cache
 def subreddit_statistics_collater(subreddit, start_date, end_date):
     """A function that looks at the information stored for a certain
     time period and generates a Markdown table for it.
@@ -1918,11 +1918,9 @@ def subreddit_statistics_collater(subreddit, start_date, end_date):
                      to get stats from.
     :return: A nice Markdown table.
     """
-    main_dictionary = {}
-    final_dictionary = {}
+    final_counter = Counter()
     format_dictionary = {}
     table_lines = []
-    total_amount = 0
     total_days = []  # The days of data that we are evaluating.
 
     # Convert those days into Unix integers.
@@ -1946,21 +1944,16 @@ def subreddit_statistics_collater(subreddit, start_date, end_date):
             stored_data = value
 
             # If the date of the data fits between our parameters, we
-            # combine the dictionaries.
+            # add that day's counts to the running totals.
             if start_unix <= stored_date <= end_unix:
                 total_days.append(date)
-                for key in main_dictionary.keys() | stored_data.keys():
-                    if key in main_dictionary:
-                        final_dictionary.setdefault(key, []).append(main_dictionary[key])
-                    if key in stored_data:
-                        final_dictionary.setdefault(key, []).append(stored_data[key])
+                final_counter.update(stored_data)
 
     # We get the total amount of all posts during this time period here.
-    for count in final_dictionary.values():
-        total_amount += sum(count)
+    total_amount = sum(final_counter.values())
 
     # Go through the dictionary and combine equivalent flairs. # NEW
-    for key, value in sorted(final_dictionary.items()):
+    for key, value in sorted(final_counter.items()):
         # We italicize this entry since it represents unflaired posts.
         # Note that it was previously marked with the string "None",
         # rather than the value `None`.
@@ -1974,9 +1967,9 @@ def subreddit_statistics_collater(subreddit, start_date, end_date):
             key_formatted = flair_sanitizer(key, False)
 
         if key_formatted in format_dictionary:
-            format_dictionary[key_formatted] += sum(value)
+            format_dictionary[key_formatted] += value
         else:
-            format_dictionary[key_formatted] = sum(value)
+            format_dictionary[key_formatted] = value
 
     # Combine the flairs and form them into a table. One line per
     # post flair entry.
@@ -2008,7 +2001,7 @@ def subreddit_statistics_collater(subreddit, start_date, end_date):
     return table_body
 
 
-def subreddit_statistics_retriever(subreddit_name):
+def subreddit_statistics_retriever(subreddit_name, commit=True):
     """A function that gets ALL of the information on a subreddit's
     statistics and returns it as Markdown tables sorted by month.
     This also incorporates the data from the Pushshift functions above.
@@ -2016,6 +2009,8 @@ def subreddit_statistics_retriever(subreddit_name):
     most top-level one.
 
     :param subreddit_name: Name of a subreddit.
+    :param commit: Whether to commit the Pushshift data saved along the
+                   way right away.
     :return: A Markdown section that collates all the existing
              information for a subreddit.
     """
@@ -2024,29 +2019,24 @@ def subreddit_statistics_retriever(subreddit_name):
     # First we want to get all the data.
     results = database.statistics_posts_retrieve(subreddit_name)
 
-    # Get a list of all the dates we have covered, oldest first.
-    # If nothing was found, just return.
-    if results is None:
-        return
-    else:
-        list_of_dates = list(sorted(results.keys()))
-
-    # Check if there are actually a list of dates. If there aren't any
-    # return.
-    if not list_of_dates:
+    # If nothing was found, or there are no dates in the results,
+    # just return.
+    if not results:
         return
 
     # Get all the months that are between our two dates with results.
-    oldest_date = list_of_dates[0]
-    newest_date = list_of_dates[-1]
+    oldest_date = min(results)
+    newest_date = max(results)
     intervals = [oldest_date, newest_date]
-    start, end = [datetime.datetime.strptime(_, "%Y-%m-%d") for _ in intervals]
-    list_of_months = list(
-        OrderedDict(
-            ((start + datetime.timedelta(_)).strftime("%Y-%m"), None)
-            for _ in range((end - start).days)
-        ).keys()
-    )
+    start, end = [datetime.date.fromisoformat(_) for _ in intervals]
+
+    # Step through the months from the start up to (but not including)
+    # the end date, jumping to the first of each following month.
+    list_of_months = []
+    month_cursor = start
+    while month_cursor < end:
+        list_of_months.append(month_cursor.isoformat()[:7])
+        month_cursor = (month_cursor.replace(day=1) + datetime.timedelta(32)).replace(day=1)
 
     # If there are results from the first day, we add the current month
     # as well. This is to allow for results from the first day to appear
@@ -2061,8 +2051,6 @@ def subreddit_statistics_retriever(subreddit_name):
         supplementary_data = []
 
         # Get the first day per month.
-        year = int(entry.split("-")[0])
-        month = int(entry.split("-")[1])
         first_day = "{}-01".format(entry)
 
         # Get the last day per month. If it's the current month, we want
@@ -2072,7 +2060,8 @@ def subreddit_statistics_retriever(subreddit_name):
         if entry == timekeeping.convert_to_string(current_time):
             last_day = timekeeping.convert_to_string(current_time - 86400)
         else:
-            last_day = "{}-{}".format(entry, monthrange(year, month)[1])
+            days_in_month = timekeeping.month_boundaries(entry)[0]
+            last_day = "{}-{}".format(entry, days_in_month)
 
         # Get the main statistics data.
         month_header = "### {}\n\n#### Activity".format(entry)
@@ -2087,7 +2076,7 @@ def subreddit_statistics_retriever(subreddit_name):
         for object_type in search_types:
             supplementary_data.append(
                 subreddit_pushshift_activity_retriever(
-                    subreddit_name, first_day, last_day, object_type
+                    subreddit_name, first_day, last_day, object_type, commit
                 )
             )
 
@@ -2096,14 +2085,14 @@ def subreddit_statistics_retriever(subreddit_name):
         for object_type in search_types:
             supplementary_data.append(
                 subreddit_pushshift_time_authors_retriever(
-                    subreddit_name, first_day, last_day, object_type
+                    subreddit_name, first_day, last_day, object_type, commit
                 )
             )
 
         # Thirdly, we combine the supplementary data and get the top
         # posts from the time period.
         supplementary_data = "".join(supplementary_data)
-        top_posts_data = subreddit_top_collater(subreddit_name, entry)
+        top_posts_data = subreddit_top_collater(subreddit_name, entry, commit=commit)
         if top_posts_data is not None:
             supplementary_data += top_posts_data
 
@@ -2111,7 +2100,9 @@ def subreddit_statistics_retriever(subreddit_name):
         # post type data from Stream and incorporate it.
         # The companion function will return `None` if the timeframe
         # will not return any data.
-        post_type_data = subreddit_stream_post_information(subreddit_name, first_day, last_day)
+        post_type_data = subreddit_stream_post_information(
+            subreddit_name, first_day, last_day, commit
+        )
         if post_type_data:
             supplementary_data += post_type_data
 
@@ -2125,7 +2116,7 @@ def subreddit_statistics_retriever(subreddit_name):
     formatted_data.reverse()
 
     # Get the three oldest posts in the sub.
-    oldest_posts = subreddit_pushshift_oldest_retriever(subreddit_name)
+    oldest_posts = subreddit_pushshift_oldest_retriever(subreddit_name, commit)
     total_data = "\n\n".join(formatted_data) + oldest_posts
 
     return total_data
@@ -2164,6 +2155,7 @@ def subreddit_statistics_retrieve_all(subreddit_name):
     # TONS of submissions, so we make it a single list with one item.
     if not actual_days_to_get:
         actual_days_to_get = [timekeeping.convert_to_string(current_time)]
+    actual_days_to_get = set(actual_days_to_get)
 
     # Now we fetch literally all the possible posts we can from Reddit
     # and put it into a list.
@@ -2180,24 +2172,13 @@ def subreddit_statistics_retrieve_all(subreddit_name):
             else:
                 days_dictionary[day_created] = [post]
 
-    # Now iterate over each day and gather the flairs for that day.
-    for day in days_dictionary.keys():
-        days_flairs = []
-        insert_dictionary = {}
-        days_posts = days_dictionary[day]
-
-        for result in days_posts:
-            result_text = result.link_flair_text
-            days_flairs.append(str(result_text))
-
-        # Now we want to generate a dictionary for the day,
-        # indexed by flair.
-        for flair in list(set(days_flairs)):
-            if flair not in insert_dictionary:
-                insert_dictionary[flair] = days_flairs.count(flair)
+    # Now iterate over each day and gather the flairs for that day,
+    # generating a dictionary for the day indexed by flair.
+    for day, days_posts in days_dictionary.items():
+        insert_dictionary = Counter(str(result.link_flair_text) for result in days_posts)
 
         # Add the dictionary to the one we will save.
-        saved_dictionary[day] = insert_dictionary
+        saved_dictionary[day] = dict(insert_dictionary)
 
     # Save the information to the database. Now that we have generated a
     # dictionary, we can insert the data.
@@ -2238,8 +2219,7 @@ def subreddit_userflair_counter(subreddit_name, flairs_to_search=None):
 
     # Check to see if emoji are actually used in user flairs on this
     # subreddit, even if the CSS class is set to blank this is okay.
-    flair_list = [x["css_class"] for x in list(relevant_sub.flair.templates)]
-    flair_list = list(set(flair_list))
+    flair_list = {x["css_class"] for x in relevant_sub.flair.templates}
     num_userflair = len(flair_list)
 
     # If there are no userflairs *at all* on the subreddit, exit.
@@ -2318,7 +2298,7 @@ def subreddit_userflair_counter(subreddit_name, flairs_to_search=None):
                                 users_flair_dict[emoji_string] = [user_flair]
 
         # Get a list of unused emoji, alphabetized.
-        unused = list(sorted(emoji_dict.keys() - usage_index.keys(), key=str.lower))
+        unused = sorted(emoji_dict.keys() - usage_index.keys(), key=str.lower)
 
         # Format our header portion.
         header_used = (
@@ -2330,7 +2310,7 @@ def subreddit_userflair_counter(subreddit_name, flairs_to_search=None):
         # If there are actually people with emoji flairs, format each
         # individual line and append it.
         if len(usage_index) > 0:
-            for emoji_string in list(sorted(emoji_dict.keys(), key=str.lower)):
+            for emoji_string in sorted(emoji_dict, key=str.lower):
                 if emoji_string in usage_index:
                     new_line = "| [{}]({}) | {} |".format(
                         emoji_string, emoji_dict[emoji_string], usage_index[emoji_string]
@@ -2353,7 +2333,7 @@ def subreddit_userflair_counter(subreddit_name, flairs_to_search=None):
                         usage_index[css_string] = 1
 
         # Get a list of unused flairs.
-        unused = list(sorted(flair_list - usage_index.keys(), key=str.lower))
+        unused = sorted(flair_list - usage_index.keys(), key=str.lower)
 
         # Format our header portion.
         header_used = (
@@ -2363,7 +2343,7 @@ def subreddit_userflair_counter(subreddit_name, flairs_to_search=None):
 
         # If there are actually people with flairs, check for CSS class.
         if len(usage_index) > 0:
-            for css_string in list(sorted(flair_list, key=str.lower)):
+            for css_string in sorted(flair_list, key=str.lower):
                 if css_string in usage_index:
                     # There is just a regular default flair.
                     if len(css_string) == 0:
@@ -2431,11 +2411,11 @@ def wikipage_creator(subreddit_name):
     # This will fail if the page does NOT exist. It will also fail
     # if the bot does not have enough permissions to create it.
     # That will throw a `Forbidden` exception.
+    # The fetched PRAW Wikipage object is the one returned, so that
+    # callers reading its text do not have to download the page again.
     try:
-        statistics_test = r.wiki[page_name].content_md
-
-        # If the page exists, then we get the PRAW Wikipage object here.
         stats_wikipage = r.wiki[page_name]
+        statistics_test = len(stats_wikipage.content_md)
         log_message = (
             "Wikipage Creator: Statistics wiki page for r/{} " "already exists with length {}."
         )
@@ -2487,13 +2467,15 @@ def wikipage_creator(subreddit_name):
     return stats_wikipage
 
 
-def wikipage_collater(subreddit_name):
+def wikipage_collater(subreddit_name, commit=True):
     """This function collates all the information together and forms the
     Markdown text used to update the wikipage.
     It does NOT post this text to the wiki; that's done by
     `wikipage_editor()`. As such this function can use the database.
 
     :param subreddit_name: Name of a subreddit.
+    :param commit: Whether to commit the data saved while collating
+                   right away.
     :return: A full Markdown page that is the equivalent of the text in
              the `assistantbot_statistics` wikipage for that subreddit.
     """
@@ -2504,7 +2486,7 @@ def wikipage_collater(subreddit_name):
     config_link = ""
 
     # Form the template by getting the various sections.
-    statistics_section = subreddit_statistics_retriever(subreddit_name)
+    statistics_section = subreddit_statistics_retriever(subreddit_name, commit)
     if statistics_section is None:
         statistics_section = "No statistics data was found."
 
@@ -2876,11 +2858,9 @@ def wikipage_status_collater(subreddit_name):
     if results is None:
         statistics_data_since = statistics_data_since.format(current_day)
     else:
-        dates = list(sorted(results.keys()))
-        if dates:
-            earliest_date = dates[0]  # The earliest date on the list.
-        else:
-            earliest_date = absent
+        # The earliest date on the list. YYYY-MM-DD strings compare in
+        # the same order as the dates themselves.
+        earliest_date = min(results, default=absent)
         statistics_data_since = statistics_data_since.format(earliest_date)
 
     # Get the activity index (the place of the subreddit relative to
@@ -2929,7 +2909,7 @@ def wikipage_get_all_actions():
 
     # Get a list of the action keys, and then create a dictionary with
     # each value set to zero.
-    all_keys = list(set().union(*[literal_eval(x[1]) for x in results]))
+    all_keys = set().union(*[literal_eval(x[1]) for x in results])
     main_dictionary = dict.fromkeys(all_keys, 0)
 
     # Iterate over each community.
@@ -3141,7 +3121,7 @@ def widget_updater(action_data):
     # fail if the page does NOT exist or is inaccessible.
     formatted_lines = []
     line = "| r/{0}{1} | **[Link](https://www.reddit.com/r/{0}/wiki/assistantbot_statistics)** |"
-    for subreddit in list(sorted(subreddit_list, key=str.lower)):
+    for subreddit in sorted(subreddit_list, key=str.lower):
         sub = reddit_helper.subreddit(subreddit)
         try:
             stats_test = sub.wiki["assistantbot_statistics"].content_md
@@ -3300,26 +3280,27 @@ def main_obtain_mentions():
     )
     retrieved_data = subreddit_pushshift_access(comment_query)
 
-    # We have comments. Iterate through them.
+    # We have comments. Fetch them all from Reddit in one `info()` call
+    # rather than one request per comment. Comments that are not
+    # accessible are simply not returned.
     # Note that username mentions should already be saved in the
     # messaging function.
     if "data" in retrieved_data:
         returned_comments = retrieved_data["data"]
-        for comment_info in returned_comments:
-            if comment_info["author"].lower() in connection.CONFIG.users_omit:
-                continue
-            comment = reddit.comment(id=comment_info["id"])  # Convert into PRAW object.
-            try:
-                if not comment.saved:  # Don't process saved comments.
-                    if comment.subreddit.display_name.lower() != INFO.username[:12].lower():
-                        full_dictionary[comment.id] = (
-                            comment.subreddit.display_name,
-                            message_template.format(comment.permalink),
-                        )
-                        logger.debug("Obtain Mentions: Found new `{}` mention.".format(comment.id))
-                        comment.save()
-            except praw.exceptions.ClientException:  # Comment is not accessible to me.
-                continue
+        comment_fullnames = [
+            "t1_{}".format(comment_info["id"])
+            for comment_info in returned_comments
+            if comment_info["author"].lower() not in connection.CONFIG.users_omit
+        ]
+        for comment in reddit.info(fullnames=comment_fullnames):
+            if not comment.saved:  # Don't process saved comments.
+                if comment.subreddit.display_name.lower() != INFO.username[:12].lower():
+                    full_dictionary[comment.id] = (
+                        comment.subreddit.display_name,
+                        message_template.format(comment.permalink),
+                    )
+                    logger.debug("Obtain Mentions: Found new `{}` mention.".format(comment.id))
+                    comment.save()
 
     # Send the retrieved mentions information to my creator,
     # if there are any. Exclude mentions in subreddits that are
@@ -3356,7 +3337,7 @@ def main_check_start():
         return
     else:
         new_subs = scratchpad.split("\n")
-        new_subs = list(set([x.strip() for x in new_subs if len(x) > 0]))
+        new_subs = {x.strip() for x in new_subs if len(x) > 0}
 
         # Convert saved data.
         for line in new_subs:
@@ -3433,10 +3414,10 @@ def seconds_till_next_run():
     :return: Returns the number of seconds remaining until the next
              action time as an integer.
     """
-    current_time = time.time()
-    current_date = timekeeping.convert_to_string(current_time)
-    last_utc_midnight = timekeeping.convert_to_unix(current_date)
-    seconds_remaining = int((last_utc_midnight + 86405) - current_time)
+    # Unix time has no leap seconds, so every UTC day is exactly 86400
+    # seconds long and the remainder is the time since last midnight.
+    # A further five seconds are added to ensure it's past midnight.
+    seconds_remaining = int(86405 - time.time() % 86400)
 
     return seconds_remaining
 
@@ -3453,7 +3434,8 @@ def main_maintenance_daily():
     """
     # Add an entry into the database so that Artemis knows it's already
     # completed the actions for the day.
-    current_day = timekeeping.convert_to_string(time.time())
+    current_time = time.time()
+    current_day = timekeeping.convert_to_string(current_time)
     database.CURSOR_STATS.execute(
         "INSERT INTO subreddit_updated VALUES (?, ?)", ("all", current_day)
     )
@@ -3462,6 +3444,12 @@ def main_maintenance_daily():
     # Back up the relevant files and cleanup excessive entries.
     database.cleanup_updated()
 
+    # Drop cached results that have expired, such as those belonging
+    # to subreddits that are no longer monitored.
+    for cache_key, (cached_time, _) in list(CLOSED_PERIOD_CACHE.items()):
+        if current_time - cached_time >= CLOSED_PERIOD_CACHE_SECONDS:
+            del CLOSED_PERIOD_CACHE[cache_key]
+
     return
 
 
@@ -3508,7 +3496,7 @@ def main_timer(manual_start=False):
 
     # Check to see if the statistics functions have already been run.
     # If we have already processed the actions for today, note that.
-    query = "SELECT * FROM subreddit_updated WHERE subreddit = ? AND date = ?"
+    query = "SELECT 1 FROM subreddit_updated WHERE subreddit = ? AND date = ?"
     database.CURSOR_STATS.execute(query, ("all", current_date_string))
     result = database.CURSOR_STATS.fetchone()
     if result is not None:
@@ -3520,7 +3508,7 @@ def main_timer(manual_start=False):
     # has already been run.
     userflair_done = True
     if int(current_date_only) in userflair_update_days and current_hour == userflair_update_time:
-        query = "SELECT * FROM subreddit_updated WHERE subreddit = ? AND date = ?"
+        query = "SELECT 1 FROM subreddit_updated WHERE subreddit = ? AND date = ?"
         database.CURSOR_STATS.execute(query, ("userflair", current_date_string))
         userflair_result = database.CURSOR_STATS.fetchone()
         if userflair_result is None:
@@ -3570,20 +3558,21 @@ def main_timer(manual_start=False):
         # Iterate over the subreddits, to see if they meet the minimum
         # amount of subscribers needed OR if they have manually opted in
         # to getting userflair statistics, or if they have opted out.
+        # An explicit setting takes precedence over the subscriber
+        # count.
         for sub in MONITORED_SUBREDDITS:
             sub_data = database.extended_retrieve(sub)
-            if database.last_subscriber_count(sub) > SETTINGS.min_s_userflair:
+            if "userflair_statistics" in sub_data:
+                include_sub = bool(sub_data["userflair_statistics"])
+            else:
+                include_sub = database.last_subscriber_count(sub) > SETTINGS.min_s_userflair
+            if include_sub:
                 userflair_check_list.append(sub)
-                if "userflair_statistics" in sub_data:
-                    if not sub_data["userflair_statistics"]:
-                        userflair_check_list.remove(sub)
-            elif "userflair_statistics" in sub_data:
-                if sub_data["userflair_statistics"]:
-                    userflair_check_list.append(sub)
-
-        # Update our counters.
+
+        # Update our counters. These are committed together with the
+        # entry below.
         for sub in userflair_check_list:
-            database.counter_updater(sub, "Updated userflair statistics", "stats")
+            database.counter_updater(sub, "Updated userflair statistics", "stats", commit=False)
         # Insert an entry into the database, telling us that it's done.
         # This is technically a 'dummy' subreddit, named `userflair`
         # much like `all` which is inserted after statistics runs.
@@ -3595,7 +3584,7 @@ def main_timer(manual_start=False):
         # Launch the secondary userflair updating thread as another
         # thread run concurrently. It is alphabetized ahead of time.
         if not userflair_done:
-            userflair_check_list = list(sorted(userflair_check_list))
+            userflair_check_list = sorted(userflair_check_list)
             logger.info(
                 "Main Timer: Checking the following subreddits "
                 "for userflairs: r/{}".format(", r/".join(userflair_check_list))
@@ -3614,35 +3603,50 @@ def main_timer(manual_start=False):
     paused_subreddits = database.monitored_paused_retrieve()
     logger.info("Main Timer: Newly updated subreddits are: {}".format(new_subreddits))
 
+    # Fetch the subscriber counts of all the monitored subreddits at
+    # once, as Reddit can return up to 100 subreddits per request.
+    # Subreddits that are not returned, such as quarantined ones, are
+    # checked individually later by `subreddit_subscribers_recorder`.
+    try:
+        subscriber_counts = {
+            x.display_name.lower(): x.subscribers
+            for x in reddit.info(subreddits=MONITORED_SUBREDDITS)
+        }
+    except connection.CONNECTION_EXCEPTIONS:
+        subscriber_counts = {}
+
+    # Get all the subreddits that have already been updated today in a
+    # single query, rather than checking for each subreddit in turn.
+    database.CURSOR_STATS.execute(
+        "SELECT subreddit FROM subreddit_updated WHERE date = ?", (current_date_string,)
+    )
+    updated_today = {x[0] for x in database.CURSOR_STATS.fetchall()}
+
     # This is the main part of gathering statistics.
     # Iterate over the communities we're monitoring, compile the
     # statistics and add to dictionary.
-    for community in MONITORED_SUBREDDITS:
+    for community_place, community in enumerate(MONITORED_SUBREDDITS, start=1):
         # Check to see if we have acted upon this subreddit for today
         # and already have its statistics.
         community_start = time.time()
         community_compiled_data = None
-        act_command = "SELECT * FROM subreddit_updated WHERE subreddit = ? AND date = ?"
-        database.CURSOR_STATS.execute(act_command, (community, current_date_string))
-        if database.CURSOR_STATS.fetchone():
+        if community in updated_today:
             # We have already updated this subreddit for today.
             logger.debug("Main Timer: Statistics already updated for r/{}".format(community))
             continue
 
-        # Begin the update, and insert an entry into the database so we
-        # know it's done. Also fetch what number this community is in
+        # Begin the update. Also fetch what number this community is in
         # the overall process (its index number) so that the progress
-        # can be measured as it goes along.
-        community_place = MONITORED_SUBREDDITS.index(community) + 1
+        # can be measured as it goes along. The writes for each
+        # subreddit are not committed as they are made. They are all
+        # committed together at the end, along with the entry marking
+        # the subreddit as done for today.
         logger.info(
             "Main Timer: BEGINNING r/{} (#{}/{}).".format(
                 community, community_place, len(MONITORED_SUBREDDITS)
             )
         )
-        database.CURSOR_STATS.execute(
-            "INSERT INTO subreddit_updated VALUES (?, ?)", (community, current_date_string)
-        )
-        database.CONN_STATS.commit()
+        updated_command = "INSERT INTO subreddit_updated VALUES (?, ?)"
 
         # Update the status widget's initial position, given a value
         # instead of zero in order to avoid an error dividing by zero.
@@ -3658,7 +3662,7 @@ def main_timer(manual_start=False):
         # Traffic data is retrieved twice in order to account for any
         # gaps that might occur due to the site issues.
         if int(current_date_only) in [SETTINGS.day_action, SETTINGS.day_traffic]:
-            subreddit_traffic_recorder(community)
+            subreddit_traffic_recorder(community, commit=False)
 
         # SKIP CHECK: See if a subreddit either
         #   a) has enough subscribers, or
@@ -3680,7 +3684,11 @@ def main_timer(manual_start=False):
         # or the statistics status is frozen, record the number of
         # subscribers and continue without recording statistics.
         if community in paused_subreddits or freeze:
-            subreddit_subscribers_recorder(community)
+            subreddit_subscribers_recorder(
+                community, commit=False, known_subscribers=subscriber_counts.get(community)
+            )
+            database.CURSOR_STATS.execute(updated_command, (community, current_date_string))
+            database.CONN_STATS.commit()
             logger.info(
                 "Main Timer: COMPLETED: r/{} below minimum or frozen. "
                 "Recorded subscribers.".format(community)
@@ -3692,17 +3700,21 @@ def main_timer(manual_start=False):
         if int(current_date_only) == SETTINGS.day_action:
             last_month_dt = datetime.date.today().replace(day=1) - datetime.timedelta(days=1)
             last_month_string = last_month_dt.strftime("%Y-%m")
-            subreddit_top_collater(community, last_month_string, last_month_mode=True)
+            subreddit_top_collater(
+                community, last_month_string, last_month_mode=True, commit=False
+            )
 
         # Update the number of subscribers and get the statistics for
         # the previous day.
-        subreddit_subscribers_recorder(community)
-        subreddit_statistics_recorder_daily(community, previous_date_string)
+        subreddit_subscribers_recorder(
+            community, commit=False, known_subscribers=subscriber_counts.get(community)
+        )
+        subreddit_statistics_recorder_daily(community, previous_date_string, commit=False)
 
         # Compile the post statistics text and add it to our dictionary.
         if community not in already_processed:
             already_processed.append(community)
-            community_compiled_data = wikipage_collater(community)
+            community_compiled_data = wikipage_collater(community, commit=False)
             logger.info("Main Timer: Compiled statistics wikipage for r/{}.".format(community))
 
         # Update the counter, as all processes are done for this sub.
@@ -3710,7 +3722,9 @@ def main_timer(manual_start=False):
             "Main Timer: COMPLETED daily collation for r/{} in {} "
             "seconds.".format(community, int(time.time() - community_start))
         )
-        database.counter_updater(community, "Updated statistics", "stats")
+        database.counter_updater(community, "Updated statistics", "stats", commit=False)
+        database.CURSOR_STATS.execute(updated_command, (community, current_date_string))
+        database.CONN_STATS.commit()
 
         # Here the function actually edits the wiki pages. There is a
         # boolean in settings which governs whether the stats are
@@ -3784,6 +3798,10 @@ if __name__ == "__main__":
                 mem_num = psutil.Process(os.getpid()).memory_info().rss
                 mem_usage = "Memory usage: {:.2f} MB.".format(mem_num / (1024 * 1024))
                 logger.info("------- Cycle {:,} COMPLETE. {}\n".format(CYCLES, mem_usage))
+            except connection.CONNECTION_EXCEPTIONS as e:
+                # A common connection issue with Reddit. Merely record
+                # it in the events log.
+                logger.error("\n### {} \n\n{}".format(e, traceback.format_exc()))
             except Exception as e:
                 # Artemis encountered an exception, and if the error
                 # is not a common connection issue, log it in a separate
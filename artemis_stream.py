@@ -12,7 +12,6 @@ When imported as a module, this script also hosts a function that can be
 used to query the database about post data.
 """
 import re
-import sqlite3
 import time
 from ast import literal_eval
 from collections import Counter
@@ -21,14 +20,13 @@ from urllib.parse import urlparse, parse_qs
 
 import connection
 import timekeeping
-from common import start_logger
-from database import database_access
+from common import logger, start_logger
+from database import database_access, database_connect
 from settings import INFO, FILE_ADDRESS, SETTINGS
 from timekeeping import convert_to_unix
 
-CONN_STREAM = sqlite3.connect(FILE_ADDRESS.data_stream)
+CONN_STREAM = database_connect(FILE_ADDRESS.data_stream)
 CURSOR_STREAM = CONN_STREAM.cursor()
-logger = start_logger(FILE_ADDRESS.logs_stream)
 
 """ACCESS/SEARCH FUNCTIONS"""
 
@@ -458,6 +456,12 @@ def get_streamed_comments(pull_amount=1000):
 # The main runtime if the module itself is called.
 # */20 * * * *
 if __name__ == "__main__":
+    # Also write to the stream's own log. This is only done when run
+    # directly, so that the statistics routine importing this module
+    # does not copy its own entries into that log. The handler is added
+    # to the same logger that was imported from `common`.
+    start_logger(FILE_ADDRESS.logs_stream)
+
     # Log into Reddit.
     start_time = time.time()
     logger.info("Stream: Beginning fetch.")
@@ -13,6 +13,10 @@ from settings import INFO, FILE_ADDRESS
 
 logger = None
 
+# Translation table used by `markdown_escaper` to escape characters
+# that have a special meaning in Markdown.
+MARKDOWN_ESCAPE_TABLE = str.maketrans({x: "\\" + x for x in "[]`*_"})
+
 """INITIALIZATION INFORMATION"""
 
 
@@ -135,12 +139,7 @@ def markdown_escaper(input_text):
     :param input_text: The text we want to work with.
     :return: `input_text`, but with the characters escaped.
     """
-    characters_to_replace = ["[", "]", "`", "*", "_"]
-
-    for character in characters_to_replace:
-        input_text = input_text.replace(character, r"\{}".format(character))
-
-    return input_text
+    return input_text.translate(MARKDOWN_ESCAPE_TABLE)
 
 
 def flair_template_checker(input_text):
@@ -4,6 +4,7 @@
 connection to Reddit.
 """
 import sys
+import time
 from types import SimpleNamespace
 
 import praw
@@ -22,6 +23,18 @@ reddit_helper = None
 reddit_monitor = None
 INSTANCE = None
 NUMBER_TO_FETCH = SETTINGS.max_get_posts
+# Exceptions raised for temporary problems connecting to Reddit, such as
+# timeouts and 5xx server errors. These are common enough that they are
+# only recorded in the events log and not in the error log.
+CONNECTION_EXCEPTIONS = (
+    prawcore.exceptions.RequestException,
+    prawcore.exceptions.ServerError,
+)
+# Cache of the mod permissions retrieved for each subreddit, indexed by
+# a tuple of (subreddit, instance) with a tuple of (time retrieved,
+# permissions). Entries are reused for `PERMISSIONS_CACHE_SECONDS`.
+PERMISSIONS_CACHE = {}
+PERMISSIONS_CACHE_SECONDS = 300
 
 
 def config_retriever():
@@ -196,7 +209,7 @@ def login(posts_frequency=True, instance_num=99):
     return
 
 
-def obtain_mod_permissions(subreddit_name, instance_num=99):
+def obtain_mod_permissions(subreddit_name, instance_num=99, use_cache=False):
     """A function to check if Artemis has mod permissions in a
     subreddit, and what kind of mod permissions it has.
     The important ones Artemis needs are: `wiki`, so that it can edit
@@ -212,10 +225,20 @@ def obtain_mod_permissions(subreddit_name, instance_num=99):
 
     :param subreddit_name: Name of a subreddit.
     :param instance_num: Instance of the mod account we are checking.
+    :param use_cache: Whether permissions retrieved within the last
+                      `PERMISSIONS_CACHE_SECONDS` can be reused.
+                      Routines that handle changes in moderation,
+                      such as invites, should leave this `False`.
     :return: A tuple. First item is `True`/`False` on whether Artemis is
                       a moderator.
                       Second item is a list of permissions, if any.
     """
+    cache_key = (subreddit_name.lower(), instance_num)
+    if use_cache and cache_key in PERMISSIONS_CACHE:
+        cached_time, cached_permissions = PERMISSIONS_CACHE[cache_key]
+        if time.time() - cached_time < PERMISSIONS_CACHE_SECONDS:
+            return cached_permissions
+
     # noinspection PyUnresolvedReferences
     r = reddit.subreddit(subreddit_name)
 
@@ -226,19 +249,22 @@ def obtain_mod_permissions(subreddit_name, instance_num=99):
 
     # This is a try/except sequence to account for private subreddits
     # since one is unable to get a mod list from a private one.
+    # The mod list already includes each moderator's permissions, so
+    # Artemis's own entry is taken from it directly.
     try:
-        moderators_list = [mod.name.lower() for mod in r.moderator()]
+        me_as_mod = [x for x in r.moderator() if x.name.lower() == check_username]
     except prawcore.exceptions.Forbidden:
+        PERMISSIONS_CACHE[cache_key] = (time.time(), (False, None))
         return False, None
-    am_mod = True if check_username in moderators_list else False
+    am_mod = True if me_as_mod else False
 
     if not am_mod:
         my_perms = None
     else:
-        me_as_mod = [x for x in r.moderator(check_username) if x.name.lower() == check_username][0]
-
         # The permissions I have become a list. e.g. `['wiki']`
-        my_perms = me_as_mod.mod_permissions
+        my_perms = me_as_mod[0].mod_permissions
+
+    PERMISSIONS_CACHE[cache_key] = (time.time(), (am_mod, my_perms))
 
     return am_mod, my_perms
 
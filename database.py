@@ -3,11 +3,12 @@
 """The database component contains functions to manage reading and
 writing to the two SQLite databases.
 """
+import os
 import sqlite3
 import time
 from ast import literal_eval
 from collections import Counter
-from json import dumps as json_dumps
+from json import dumps as json_dumps, loads as json_loads
 
 from common import logger
 from settings import FILE_ADDRESS, SETTINGS
@@ -16,10 +17,39 @@ from timekeeping import convert_to_string
 
 """BASE DEFINITIONS"""
 
-CONN_STATS = sqlite3.connect(FILE_ADDRESS.data_stats)
-CURSOR_STATS = CONN_STATS.cursor()
-CONN_MAIN = sqlite3.connect(FILE_ADDRESS.data_main)
-CURSOR_MAIN = CONN_MAIN.cursor()
+
+def database_connect(address):
+    """This function opens a connection to an SQLite database file and
+    sets it up for Artemis's usage. The database is switched to
+    write-ahead logging, which lets the routines read from a database
+    while another is writing to it, and makes commits cheaper since
+    each one no longer needs to sync the whole journal to disk.
+
+    :param address: The file path of the database.
+    :return: An SQLite connection object.
+    """
+    conn = sqlite3.connect(address)
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute("PRAGMA cache_size = -64000;")
+
+    return conn
+
+
+# The connections to the statistics and main databases. These are
+# opened by `define_database()` when this module is loaded, and can be
+# reopened for another instance's databases.
+CONN_STATS = None
+CURSOR_STATS = None
+CONN_MAIN = None
+CURSOR_MAIN = None
+
+# A cache of the flair enforcing status of monitored subreddits, keyed
+# by subreddit name. It is filled on first use and kept up to date by
+# the functions that change the `monitored` table, which are only
+# called by the main routine.
+ENFORCE_CACHE = {}
 
 
 """DATABASE DEFINITIONS"""
@@ -47,13 +77,19 @@ def define_database(instance_num=99):
         logger.info("Define Database: Using database for instance {}.".format(instance_num))
 
     # This connects Artemis with its statistics SQLite database file.
-    CONN_STATS = sqlite3.connect(stats_address)
+    CONN_STATS = database_connect(stats_address)
     CURSOR_STATS = CONN_STATS.cursor()
 
     # This connects Artemis with its flair enforcement SQLite
     # database file.
-    CONN_MAIN = sqlite3.connect(main_address)
+    CONN_MAIN = database_connect(main_address)
     CURSOR_MAIN = CONN_MAIN.cursor()
+    ENFORCE_CACHE.clear()
+
+    # Create the database tables if they do not exist, and convert any
+    # older data that is now stored as JSON.
+    table_creator()
+    json_migrate_stats()
 
     return
 
@@ -80,6 +116,23 @@ def table_creator():
     CURSOR_MAIN.execute(
         "CREATE TABLE IF NOT EXISTS subreddit_actions " "(subreddit text, recorded_actions text);"
     )
+
+    # Processed post IDs are kept unique so that inserting an ID that
+    # has already been recorded is simply ignored.
+    unique_index_creator(CURSOR_MAIN, "posts_processed", "post_id")
+
+    # Index the columns that subreddits and posts are looked up by, so
+    # that those queries do not have to scan the whole table.
+    CURSOR_MAIN.execute("CREATE INDEX IF NOT EXISTS index_monitored ON monitored (subreddit);")
+    CURSOR_MAIN.execute(
+        "CREATE INDEX IF NOT EXISTS index_posts_filtered ON posts_filtered (post_id);"
+    )
+    CURSOR_MAIN.execute(
+        "CREATE INDEX IF NOT EXISTS index_posts_operations ON posts_operations (id);"
+    )
+    CURSOR_MAIN.execute(
+        "CREATE INDEX IF NOT EXISTS index_subreddit_actions ON subreddit_actions (subreddit);"
+    )
     CONN_MAIN.commit()
 
     # Parse and create the statistics database if necessary.
@@ -102,6 +155,107 @@ def table_creator():
     CURSOR_STATS.execute(
         "CREATE TABLE IF NOT EXISTS subreddit_updated " "(subreddit text, date text);"
     )
+
+    # Traffic and subscriber data are kept to one entry per subreddit,
+    # so that new data can be merged into them with a single upsert.
+    unique_index_creator(CURSOR_STATS, "subreddit_subscribers_new", "subreddit")
+    unique_index_creator(CURSOR_STATS, "subreddit_traffic", "subreddit")
+
+    # The remaining statistics tables are looked up by subreddit, and
+    # the dated ones by subreddit and date together.
+    CURSOR_STATS.execute(
+        "CREATE INDEX IF NOT EXISTS index_subreddit_actions ON subreddit_actions (subreddit);"
+    )
+    CURSOR_STATS.execute(
+        "CREATE INDEX IF NOT EXISTS index_subreddit_activity "
+        "ON subreddit_activity (subreddit, date);"
+    )
+    CURSOR_STATS.execute(
+        "CREATE INDEX IF NOT EXISTS index_subreddit_stats_posts "
+        "ON subreddit_stats_posts (subreddit);"
+    )
+    CURSOR_STATS.execute(
+        "CREATE INDEX IF NOT EXISTS index_subreddit_updated "
+        "ON subreddit_updated (subreddit, date);"
+    )
+    CONN_STATS.commit()
+    return
+
+
+def unique_index_creator(cursor, table, column):
+    """This function creates a unique index on a table's column if it
+    does not already exist. Older databases may have duplicate entries,
+    which are cleared (keeping the first) before the index is created.
+
+    :param cursor: The cursor of the database the table is in.
+    :param table: The name of the table.
+    :param column: The name of the column to index.
+    :return: `None`.
+    """
+    index_command = "CREATE UNIQUE INDEX IF NOT EXISTS index_{0} ON {0} ({1});".format(
+        table, column
+    )
+    try:
+        cursor.execute(index_command)
+    except sqlite3.IntegrityError:
+        cursor.execute(
+            "DELETE FROM {0} WHERE rowid NOT IN "
+            "(SELECT MIN(rowid) FROM {0} GROUP BY {1})".format(table, column)
+        )
+        cursor.execute(index_command)
+        logger.info("Table Creator: Removed duplicate entries from `{}`.".format(table))
+
+    return
+
+
+def json_migrator(table, column, connection=None):
+    """This function converts data in a statistics table that was saved
+    in the older Python dictionary format (e.g. `{'2020-01': [1, 2]}`)
+    into JSON. Rows that are already in JSON are skipped, so after the
+    first run this does nothing.
+
+    :param table: The name of the table in the statistics database.
+    :param column: The name of the column holding the dictionaries.
+    :param connection: A connection to a statistics database. If not
+                       passed, the active statistics database is used.
+    :return: `None`.
+    """
+    if connection is None:
+        connection = CONN_STATS
+    cursor = connection.cursor()
+
+    cursor.execute(
+        "SELECT subreddit, {0} FROM {1} WHERE {0} LIKE '{{''%'".format(column, table)
+    )
+    results = cursor.fetchall()
+    if not results:
+        return
+
+    # Convert each dictionary and save them back together.
+    converted = [(json_dumps(literal_eval(x[1])), x[0]) for x in results]
+    update_command = "UPDATE {} SET {} = ? WHERE subreddit = ?".format(table, column)
+    cursor.executemany(update_command, converted)
+    connection.commit()
+    logger.info(
+        "JSON Migrator: Converted `{}` data for {:,} subreddits.".format(table, len(results))
+    )
+
+    return
+
+
+def json_migrate_stats(connection=None):
+    """This function converts all the statistics tables that are now
+    stored as JSON. It should be run on any statistics database before
+    it is read from or written to, including those of other instances.
+
+    :param connection: A connection to a statistics database. If not
+                       passed, the active statistics database is used.
+    :return: `None`.
+    """
+    json_migrator("subreddit_traffic", "traffic", connection)
+    json_migrator("subreddit_stats_posts", "records", connection)
+    json_migrator("subreddit_subscribers_new", "records", connection)
+
     return
 
 
@@ -163,7 +317,7 @@ def subreddit_insert(community_name, supplement):
     :return: Nothing.
     """
     community_name = community_name.lower()
-    command = "SELECT * FROM monitored WHERE subreddit = ?"
+    command = "SELECT 1 FROM monitored WHERE subreddit = ?"
     CURSOR_MAIN.execute(command, (community_name,))
     result = CURSOR_MAIN.fetchone()
 
@@ -174,6 +328,8 @@ def subreddit_insert(community_name, supplement):
             "INSERT INTO monitored VALUES (?, ?, ?)", (community_name, 1, str(supplement))
         )
         CONN_MAIN.commit()
+        if ENFORCE_CACHE:
+            ENFORCE_CACHE[community_name] = True
         logger.info("Sub Insert: r/{} added to monitored database.".format(community_name))
 
     return
@@ -187,12 +343,13 @@ def subreddit_delete(community_name):
     :return: Nothing.
     """
     community_name = community_name.lower()
-    CURSOR_MAIN.execute("SELECT * FROM monitored WHERE subreddit = ?", (community_name,))
+    CURSOR_MAIN.execute("SELECT 1 FROM monitored WHERE subreddit = ?", (community_name,))
     result = CURSOR_MAIN.fetchone()
 
     if result is not None:  # Subreddit is in database. Let's remove it.
         CURSOR_MAIN.execute("DELETE FROM monitored WHERE subreddit = ?", (community_name,))
         CONN_MAIN.commit()
+        ENFORCE_CACHE.pop(community_name, None)
         logger.info("Sub Delete: r/{} deleted from monitored database.".format(community_name))
 
     return
@@ -241,19 +398,22 @@ def monitored_subreddits_enforce_change(subreddit_name, to_enforce):
     s_digit = int(to_enforce)
 
     # Access the database.
-    CURSOR_MAIN.execute("SELECT * FROM monitored WHERE subreddit = ?", (subreddit_name,))
+    command = "SELECT flair_enforce FROM monitored WHERE subreddit = ?"
+    CURSOR_MAIN.execute(command, (subreddit_name,))
     result = CURSOR_MAIN.fetchone()
 
     # This subreddit is stored in the monitored database; modify it.
     if result is not None:
 
         # If the current status is different, change it.
-        if result[1] != s_digit:
+        if result[0] != s_digit:
             CURSOR_MAIN.execute(
                 "UPDATE monitored SET flair_enforce = ? WHERE subreddit = ?",
                 (s_digit, subreddit_name),
             )
             CONN_MAIN.commit()
+            if ENFORCE_CACHE:
+                ENFORCE_CACHE[subreddit_name] = bool(s_digit)
             logger.info(
                 "Enforce Change: r/{} flair enforce set to `{}`.".format(
                     subreddit_name, to_enforce
@@ -263,21 +423,38 @@ def monitored_subreddits_enforce_change(subreddit_name, to_enforce):
     return
 
 
-def monitored_subreddits_enforce_status(subreddit_name):
+def monitored_subreddits_enforce_status(subreddit_name, cached=False):
     """A function that returns True or False depending on the
     subreddit's `flair_enforce` status.
     That status is stored as an integer and converted into a Boolean.
 
     :param subreddit_name: Name of a subreddit (no r/).
+    :param cached: Whether to answer from `ENFORCE_CACHE` instead of
+                   querying the database. Only the main routine should
+                   use this, as it is the one that changes the status;
+                   other routines would otherwise see stale data.
     :return: A boolean. Default is True.
     """
     subreddit_name = subreddit_name.lower()
-    result = database_access("SELECT * FROM monitored WHERE subreddit = ?", (subreddit_name,))
+
+    # Load every subreddit's status at once the first time the cache
+    # is needed, and afterwards just look it up.
+    if cached:
+        if not ENFORCE_CACHE:
+            results = database_access(
+                "SELECT subreddit, flair_enforce FROM monitored", None, fetch_many=True
+            )
+            if results:
+                ENFORCE_CACHE.update({x[0].lower(): bool(x[1]) for x in results})
+        return ENFORCE_CACHE.get(subreddit_name, True)
+
+    command = "SELECT flair_enforce FROM monitored WHERE subreddit = ?"
+    result = database_access(command, (subreddit_name,))
 
     # This subreddit is stored in our monitored database; access it.
     if result is not None:
         # This is the current status.
-        flair_enforce_status = bool(result[1])
+        flair_enforce_status = bool(result[0])
         logger.debug(
             "Enforce Status: r/{} flair enforce status: {}.".format(
                 subreddit_name, flair_enforce_status
@@ -304,22 +481,49 @@ def monitored_paused_retrieve():
     return paused_subs
 
 
-def delete_filtered_post(post_id):
+def delete_filtered_post(post_id, commit=True):
     """This function deletes a post ID from the flair filtered
     database. Either because it's too old, or because it has
     been approved and restored. Trying to delete a non-existent ID
     just won't do anything.
 
     :param post_id: The Reddit submission's ID, as a string.
+    :param commit: Whether to commit the deletion right away. If
+                   `False`, the caller is responsible for committing it.
     :return: `None`.
     """
     CURSOR_MAIN.execute("DELETE FROM posts_filtered WHERE post_id = ?", (post_id,))
-    CONN_MAIN.commit()
+    if commit:
+        CONN_MAIN.commit()
     logger.debug("Delete Filtered Post: Deleted post `{}` from filtered database.".format(post_id))
 
     return
 
 
+def processed_retrieve(post_ids, chunk_size=500):
+    """This function checks a list of post IDs against the
+    `posts_processed` table and returns the ones that have already been
+    recorded there. The IDs are queried in chunks in order to stay under
+    SQLite's limit on the number of variables in a single statement.
+
+    :param post_ids: A list of Reddit submission IDs, as strings.
+    :param chunk_size: The number of IDs to query at once.
+    :return: A set of the post IDs that have already been processed.
+    """
+    recorded = set()
+
+    for i in range(0, len(post_ids), chunk_size):
+        chunk = post_ids[i:i + chunk_size]
+        query = "SELECT post_id FROM posts_processed WHERE post_id IN ({})".format(
+            ", ".join("?" * len(chunk))
+        )
+        results = database_access(query, tuple(chunk), fetch_many=True)
+        if results:
+            recorded.update(x[0] for x in results)
+
+    return recorded
+
+
 def last_subscriber_count(subreddit_name):
     """A function that returns the last and most recent local saved
     subscriber value for a given subreddit.
@@ -334,8 +538,7 @@ def last_subscriber_count(subreddit_name):
     # If we already have stored subscriber data, get the last value.
     if stored_data is not None:
         # This is the last day we have subscriber data for.
-        last_day = list(sorted(stored_data.keys()))[-1]
-        num_subscribers = stored_data[last_day]
+        num_subscribers = stored_data[max(stored_data)]
 
     return num_subscribers
 
@@ -414,7 +617,7 @@ def activity_retrieve(subreddit_name, month, activity_type):
     return
 
 
-def activity_insert(subreddit_name, month, activity_type, activity_data):
+def activity_insert(subreddit_name, month, activity_type, activity_data, commit=True):
     """This function merges data passed to it with the equivalent
     entry in `subreddit_activity`.
 
@@ -424,6 +627,7 @@ def activity_insert(subreddit_name, month, activity_type, activity_data):
                           (often used as a dictionary index).
     :param activity_data: The dictionary corresponding to the type
                           above that we want to store.
+    :param commit: Whether to commit the data right away.
     :return:
     """
     CURSOR_STATS.execute(
@@ -439,10 +643,10 @@ def activity_insert(subreddit_name, month, activity_type, activity_data):
             data_component = {activity_type: activity_data}
             data_package = (subreddit_name, month, str(data_component))
             CURSOR_STATS.execute("INSERT INTO subreddit_activity VALUES (?, ?, ?)", data_package)
-            CONN_STATS.commit()
         else:  # 'oldest' posts get indexed by that phrase instead of by month.
             data_package = (subreddit_name, "oldest", str(activity_data))
             CURSOR_STATS.execute("INSERT INTO subreddit_activity VALUES (?, ?, ?)", data_package)
+        if commit:
             CONN_STATS.commit()
     else:
         # We already have data for this. Note that we don't need to
@@ -459,12 +663,13 @@ def activity_insert(subreddit_name, month, activity_type, activity_data):
                 "UPDATE subreddit_activity SET activity = ? " "WHERE subreddit = ? AND date = ?"
             )
             CURSOR_STATS.execute(update_command, (str(existing_data), subreddit_name, month))
-            CONN_STATS.commit()
+            if commit:
+                CONN_STATS.commit()
 
     return
 
 
-def subscribers_insert(subreddit_name, new_data):
+def subscribers_insert(subreddit_name, new_data, commit=True):
     """This function merges subscriber data in a dictionary passed to
     it with the already saved information, or creates a new entry by
     the subreddit's name.
@@ -477,31 +682,22 @@ def subscribers_insert(subreddit_name, new_data):
     :param new_data: A dictionary in this form: {'YYYY-MM-DD': XXXX}
                      where the key is a date string and the value
                      is an integer.
+    :param commit: Whether to commit the change right away. The daily
+                   statistics loop passes `False` and commits once
+                   per subreddit instead.
     :return:
     """
-    # Check the database first.
+    # If there is no preexisting subscribers entry, create a new one.
+    # If we already have data for this subreddit, merge the two
+    # together. SQLite's `json_patch` merges them like `dict.update()`.
     subreddit_name = subreddit_name.lower()
-    CURSOR_STATS.execute(
-        "SELECT * FROM subreddit_subscribers_new WHERE subreddit = ?", (subreddit_name,)
+    upsert_command = (
+        "INSERT INTO subreddit_subscribers_new VALUES (?, ?) ON CONFLICT (subreddit) "
+        "DO UPDATE SET records = json_patch(records, excluded.records)"
     )
-    result = CURSOR_STATS.fetchone()
-
-    # Process the data. If there is no preexisting subscribers entry,
-    # create a new one.
-    if result is None:
-        data_package = (subreddit_name, str(new_data))
-        CURSOR_STATS.execute("INSERT INTO subreddit_subscribers_new VALUES (?, ?)", data_package)
-        CONN_STATS.commit()
-    else:
-        # We already have data for this subreddit, so we want to merge
-        # the two together.
-        existing_dictionary = literal_eval(result[1])
-        working_dictionary = existing_dictionary.copy()
-        working_dictionary.update(new_data)
+    CURSOR_STATS.execute(upsert_command, (subreddit_name, json_dumps(new_data)))
 
-        # Update the saved data.
-        update_command = "UPDATE subreddit_subscribers_new SET records = ? WHERE subreddit = ?"
-        CURSOR_STATS.execute(update_command, (str(working_dictionary), subreddit_name))
+    if commit:
         CONN_STATS.commit()
 
     return
@@ -526,12 +722,12 @@ def subscribers_retrieve(subreddit_name):
 
     # We have data, let's turn the stored string into a dictionary.
     if result is not None:
-        return literal_eval(result[1])
+        return json_loads(result[1])
 
     return
 
 
-def statistics_posts_insert(subreddit_name, new_data):
+def statistics_posts_insert(subreddit_name, new_data, commit=True):
     """This function inserts a given dictionary of statistics posts
     data into the corresponding subreddit's entry. This replaces an
     earlier system which used individual rows for each day's
@@ -545,6 +741,7 @@ def statistics_posts_insert(subreddit_name, new_data):
                      string and the value is another dictionary
                      indexed by post flair and containing
                      integer values.
+    :param commit: Whether to commit the change right away.
     :return: Nothing.
     """
     # Check the database first.
@@ -556,12 +753,11 @@ def statistics_posts_insert(subreddit_name, new_data):
 
     # We have no data.
     if result is None:
-        data_package = (subreddit_name, str(new_data))
+        data_package = (subreddit_name, json_dumps(new_data))
         CURSOR_STATS.execute("INSERT INTO subreddit_stats_posts VALUES (?, ?)", data_package)
-        CONN_STATS.commit()
     else:
         # There is already an entry for this subreddit in our database.
-        existing_dictionary = literal_eval(result[1])
+        existing_dictionary = json_loads(result[1])
         working_dictionary = existing_dictionary.copy()
 
         # Update the working dictionary with the new data.
@@ -572,7 +768,9 @@ def statistics_posts_insert(subreddit_name, new_data):
 
         # Update the dictionary.
         update_command = "UPDATE subreddit_stats_posts SET records = ? WHERE subreddit = ?"
-        CURSOR_STATS.execute(update_command, (str(working_dictionary), subreddit_name))
+        CURSOR_STATS.execute(update_command, (json_dumps(working_dictionary), subreddit_name))
+
+    if commit:
         CONN_STATS.commit()
 
     return
@@ -599,13 +797,19 @@ def statistics_posts_retrieve(subreddit_name):
 
     # We have data, let's turn the stored string into a dictionary.
     if result is not None:
-        return literal_eval(result[1])
+        return json_loads(result[1])
 
     return
 
 
 def counter_updater(
-    subreddit_name, action_type, database_type, action_count=1, post_id=None, id_only=False
+    subreddit_name,
+    action_type,
+    database_type,
+    action_count=1,
+    post_id=None,
+    id_only=False,
+    commit=True,
 ):
     """This function writes a certain number to an action log in the
     database to indicate how many times an action has been performed for
@@ -636,6 +840,9 @@ def counter_updater(
                     recorded only to the post ID operations log.
                     If `True`, then this will not be recorded in the SQL
                     database.
+    :param commit: Whether to commit the changes right away. If `False`,
+                   the caller is responsible for committing them, which
+                   allows many updates to share a single transaction.
     :return: `None`.
     """
     # Switch the databases based on the input.
@@ -649,7 +856,7 @@ def counter_updater(
     # If the data is for a single post, we can save it to the
     # per-post ID operations log.
     if action_count == 1 and post_id:
-        counter_cursor.execute("SELECT * FROM posts_operations WHERE id = ?", (post_id,))
+        counter_cursor.execute("SELECT operations FROM posts_operations WHERE id = ?", (post_id,))
         operation_result = counter_cursor.fetchone()
 
         # In case the main file is blank, recreate it. Note that the
@@ -658,7 +865,7 @@ def counter_updater(
             operation_result = {}
             op_command = "INSERT INTO posts_operations (operations, id) VALUES (?, ?)"
         else:
-            operation_result = literal_eval(operation_result[1])  # This is a dictionary.
+            operation_result = literal_eval(operation_result[0])  # This is a dictionary.
             op_command = "UPDATE posts_operations SET operations = ? WHERE id = ?"
 
         # Create the data package to update the main dictionary with.
@@ -669,7 +876,8 @@ def counter_updater(
             operation_result = post_package
 
         counter_cursor.execute(op_command, (str(operation_result), post_id))
-        conn.commit()
+        if commit:
+            conn.commit()
 
     # Exit early if all we want is to record to that operations log.
     if id_only:
@@ -693,7 +901,8 @@ def counter_updater(
         actions_dictionary = {action_type: action_count}
         data_package = (subreddit_name, str(actions_dictionary))
         counter_cursor.execute("INSERT INTO subreddit_actions VALUES (?, ?)", data_package)
-        conn.commit()
+        if commit:
+            conn.commit()
     else:  # We already have an entry recorded for this.
         # Convert this back into a dictionary.
         actions_dictionary = literal_eval(result[1])
@@ -707,7 +916,8 @@ def counter_updater(
         # Update the existing data.
         update_command = "UPDATE subreddit_actions SET recorded_actions = ? WHERE subreddit = ?"
         counter_cursor.execute(update_command, (str(actions_dictionary), subreddit_name))
-        conn.commit()
+        if commit:
+            conn.commit()
 
     # Also save the data to the master actions dictionary.
     # That dictionary is classified under `all`.
@@ -731,14 +941,16 @@ def counter_updater(
         # Update the master actions data.
         update_command = "UPDATE subreddit_actions SET recorded_actions = ? WHERE subreddit = ?"
         counter_cursor.execute(update_command, (str(master_actions), "all"))
-        conn.commit()
+        if commit:
+            conn.commit()
     else:
         # Create an "all" master entry in the database for actions
         # if one doesn't already exist. This is likely to only happen
         # a single time per database file.
         create_command = "INSERT INTO subreddit_actions VALUES (?, ?)"
         counter_cursor.execute(create_command, ("all", str({})))
-        conn.commit()
+        if commit:
+            conn.commit()
         logger.info("Counter Updater: Created new 'all' entry in `subreddit_actions` table.")
 
     return
@@ -863,9 +1075,9 @@ def migration_assistant(subreddit_name, source, target):
         else:
             stats_address = "{}{}.db".format(FILE_ADDRESS.data_stats[:-3], instance_num)
             main_address = "{}{}.db".format(FILE_ADDRESS.data_main[:-3], instance_num)
-        conn_stats = sqlite3.connect(stats_address)
+        conn_stats = database_connect(stats_address)
         cursor_stats = conn_stats.cursor()
-        conn_main = sqlite3.connect(main_address)
+        conn_main = database_connect(main_address)
         cursor_main = conn_main.cursor()
         database_dictionary[database_type] = {
             "instance": instance_num,
@@ -964,6 +1176,9 @@ def migration_assistant(subreddit_name, source, target):
                     "Migration Assistant: Data inserted for r/{} "
                     "into target stats table `{}`.".format(subreddit_name, table)
                 )
+    # The copied rows may come from a database that was never converted
+    # to JSON, so convert any older data that is now in the target.
+    json_migrate_stats(conn_target_stats)
     # Insert stats activity data.
     for line in stats_activity_data:
         month = line[1]
@@ -1050,7 +1265,7 @@ def takeout(subreddit_name):
     CURSOR_STATS.execute("SELECT * FROM subreddit_traffic WHERE subreddit = ?", (subreddit_name,))
     traffic_result = CURSOR_STATS.fetchone()
     if traffic_result is not None:
-        master_dictionary["traffic"] = literal_eval(traffic_result[1])
+        master_dictionary["traffic"] = json_loads(traffic_result[1])
 
     # Convert to JSON.
     master_json = json_dumps(master_dictionary, sort_keys=True, indent=4)
@@ -1073,39 +1288,52 @@ def cleanup():
     lines_to_keep = int(SETTINGS.entries_to_keep / SETTINGS.lines_to_keep_divider)
     ops_to_keep = int(SETTINGS.entries_to_keep * SETTINGS.operations_to_keep_multiplier)
 
-    # Access the `processed` database, order the posts by oldest first,
-    # and then only keep the above number of entries.
-    delete_command = (
-        "DELETE FROM posts_processed WHERE post_id NOT IN "
-        "(SELECT post_id FROM posts_processed ORDER BY post_id DESC LIMIT ?)"
-    )
-    CURSOR_MAIN.execute(delete_command, (SETTINGS.entries_to_keep,))
-    CONN_MAIN.commit()
+    # Access the `processed` database and find the oldest post ID that
+    # is still within the number of entries to keep. Everything before
+    # it is then deleted. Both steps can use the table's index instead
+    # of sorting the whole table.
+    cutoff_command = "SELECT post_id FROM posts_processed ORDER BY post_id DESC LIMIT 1 OFFSET ?"
+    CURSOR_MAIN.execute(cutoff_command, (SETTINGS.entries_to_keep - 1,))
+    cutoff = CURSOR_MAIN.fetchone()
+    if cutoff is not None:
+        CURSOR_MAIN.execute("DELETE FROM posts_processed WHERE post_id < ?", cutoff)
+        CONN_MAIN.commit()
     logger.info(
         "Cleanup: Last {:,} processed database " "entries kept.".format(SETTINGS.entries_to_keep)
     )
 
-    # Access the `operations` database, and order the entries by
-    # oldest first.
-    delete_command = (
-        "DELETE FROM posts_operations WHERE id NOT IN "
-        "(SELECT id FROM posts_operations ORDER BY id DESC LIMIT ?)"
-    )
-    CURSOR_MAIN.execute(delete_command, (ops_to_keep,))
-    CONN_MAIN.commit()
+    # Access the `operations` database and trim it the same way, using
+    # the index on its post IDs.
+    cutoff_command = "SELECT id FROM posts_operations ORDER BY id DESC LIMIT 1 OFFSET ?"
+    CURSOR_MAIN.execute(cutoff_command, (ops_to_keep - 1,))
+    cutoff = CURSOR_MAIN.fetchone()
+    if cutoff is not None:
+        CURSOR_MAIN.execute("DELETE FROM posts_operations WHERE id < ?", cutoff)
+        CONN_MAIN.commit()
     logger.info("Cleanup: Last {:,} operations database " "entries kept.".format(ops_to_keep))
 
     # Clean up the logs. Keep only the last `lines_to_keep` lines.
-    with open(FILE_ADDRESS.logs, "r", encoding="utf-8") as f:
-        lines_entries = [line.rstrip("\n") for line in f]
-
-    # If there are more lines than what we want to keep, truncate the
-    # entire file to our limit.
-    if len(lines_entries) > lines_to_keep:
-        lines_entries = lines_entries[(-1 * lines_to_keep) :]
-        with open(FILE_ADDRESS.logs, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines_entries))
-        logger.info("Cleanup: Last {:,} log entries kept.".format(lines_to_keep))
+    # Rather than reading the whole file, read backwards from the end
+    # in blocks until enough lines have been found. The file is then
+    # rewritten in place rather than replaced, as the routines' logging
+    # handlers keep it open for appending.
+    with open(FILE_ADDRESS.logs, "rb+") as f:
+        position = f.seek(0, os.SEEK_END)
+        tail = b""
+        while position > 0 and tail.count(b"\n") <= lines_to_keep:
+            block_size = min(65536, position)
+            position -= block_size
+            f.seek(position)
+            tail = f.read(block_size) + tail
+
+        # If there are more lines than what we want to keep, truncate
+        # the entire file to our limit.
+        lines_entries = tail.splitlines(keepends=True)
+        if position > 0 or len(lines_entries) > lines_to_keep:
+            f.seek(0)
+            f.write(b"".join(lines_entries[(-1 * lines_to_keep) :]))
+            f.truncate()
+            logger.info("Cleanup: Last {:,} log entries kept.".format(lines_to_keep))
 
     return
 
@@ -1134,4 +1362,3 @@ def cleanup_updated():
 
 
 define_database()
-table_creator()  # Create the database tables if they do not exist.
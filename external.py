@@ -7,6 +7,7 @@ regular runtime, they tend to be less documented or updated, and the
 code may not be the cleanest.
 """
 import datetime
+import json
 import os
 import sqlite3
 import sys
@@ -15,7 +16,7 @@ from ast import literal_eval
 from calendar import monthrange
 from collections import Counter
 from random import sample
-from shutil import copy
+from shutil import copyfile
 
 import praw
 import prawcore
@@ -48,9 +49,10 @@ reddit_monitor = praw.Reddit(
 stats_address_1 = "{}{}.db".format(FILE_ADDRESS.data_stats[:-3], 1)
 main_address_1 = "{}{}.db".format(FILE_ADDRESS.data_main[:-3], 1)
 
-CONN_STATS_1 = sqlite3.connect(stats_address_1)
+CONN_STATS_1 = database.database_connect(stats_address_1)
 CURSOR_STATS_1 = CONN_STATS_1.cursor()
-CONN_MAIN_1 = sqlite3.connect(main_address_1)
+database.json_migrate_stats(CONN_STATS_1)
+CONN_MAIN_1 = database.database_connect(main_address_1)
 CURSOR_MAIN_1 = CONN_MAIN_1.cursor()
 
 
@@ -67,10 +69,9 @@ def monitor_seconds_till_next_hour():
     """
     # Returns the current Unix timestamp.
     current_waktu = int(time.time())
-    w = time.strftime("%Y:%m:%d:%H")
 
-    # Choose the next time to run.
-    next_time = int(time.mktime(datetime.datetime.strptime(w, "%Y:%m:%d:%H").timetuple())) + 3600
+    # Choose the next time to run, which is the start of the next hour.
+    next_time = current_waktu - current_waktu % 3600 + 3600
     seconds_remaining = (SETTINGS.monitor_time_check * 60) + next_time - current_waktu
 
     return seconds_remaining
@@ -229,6 +230,26 @@ def monitor_main():
 """TESTING / EXTERNAL FUNCTIONS"""
 
 
+def external_backup_database(source_path, target_path):
+    """This function makes a consistent copy of an SQLite database,
+    including any commits still in its write-ahead log, by using
+    SQLite's own online backup.
+
+    :param source_path: The file path of the database to back up.
+    :param target_path: The file path to write the backup to.
+    :return: Nothing.
+    """
+    source_conn = sqlite3.connect(source_path)
+    target_conn = sqlite3.connect(target_path)
+    try:
+        source_conn.backup(target_conn)
+    finally:
+        target_conn.close()
+        source_conn.close()
+
+    return
+
+
 def external_backup_daily():
     """This function backs up the database files to a secure Box account
     and a local target. It does not back up the credentials file or the
@@ -260,33 +281,44 @@ def external_backup_daily():
                     "already exists at {}.".format(current_day, backup_path)
                 )
             else:
-                # Create the new target folder and get the list of files
-                # from the home folder.
+                # Create the new target folder and get the files from
+                # the home folder. `scandir` already knows each entry's
+                # type, so no separate check is needed for each file.
                 os.makedirs(new_folder_path)
-                source_files = os.listdir(SOURCE_FOLDER)
+                with os.scandir(SOURCE_FOLDER) as source_entries:
+                    source_files = [x for x in source_entries if x.is_file()]
 
                 # We don't need to back up files with these file name
-                # extensions. Exclude them from backup.
-                xc = ["journal", ".json", ".out", ".py", ".yaml"]
-                source_files = [x for x in source_files if not any(keyword in x for keyword in xc)]
+                # extensions. Exclude them from backup. The write-ahead
+                # log and shared memory files of the databases are
+                # included in the databases' own backups below.
+                xc = ("journal", "-shm", "-wal", ".json", ".out", ".py", ".yaml")
+                source_files = [x for x in source_files if not x.name.endswith(xc)]
 
                 # Iterate over each file and back it up.
-                for file_name in source_files:
+                for file_entry in source_files:
 
                     # Ignore period-prefixed temporary files.
-                    if file_name.startswith("."):
+                    if file_entry.name.startswith("."):
                         continue
 
-                    # Get the full path of the file.
-                    full_file_name = os.path.join(SOURCE_FOLDER, file_name)
-
-                    # If the file exists, try backing it up. If there
-                    # happens to be a copying error, skip the file.
-                    if os.path.isfile(full_file_name):
-                        try:
-                            copy(full_file_name, new_folder_path)
-                        except OSError:
-                            pass
+                    # Try backing up the file. If there happens to be a
+                    # copying error, skip the file.
+                    # The databases are in write-ahead logging mode, so
+                    # their files alone may not hold the latest commits.
+                    # They are backed up through SQLite instead, which
+                    # gives a consistent copy including the log.
+                    # Other files only need their contents, so
+                    # `copyfile` is given the full target path, which
+                    # lets it use the system's in-kernel copy.
+                    target_path = os.path.join(new_folder_path, file_entry.name)
+                    try:
+                        if file_entry.name.endswith(".db"):
+                            external_backup_database(file_entry.path, target_path)
+                        else:
+                            copyfile(file_entry.path, target_path)
+                    except (OSError, sqlite3.Error):
+                        pass
 
                 logger.info("Backup: Completed for {}.".format(current_day))
 
@@ -494,8 +526,7 @@ def external_artemis_monthly_statistics(month_string):
                 logger.info(f"Error in main dictionary encountered on {date}.")
 
     # Combine the actions together in a single dictionary.
-    all_days = list(set(list(actions_s_master.keys()) + list(actions_m_master.keys())))
-    all_days.sort()
+    all_days = sorted(actions_s_master.keys() | actions_m_master.keys())
     subset_days = all_days[all_days.index(first_day) :]
     for day in subset_days:
         if day in actions_s_master:
@@ -599,7 +630,7 @@ def external_artemis_monthly_statistics(month_string):
     database.CURSOR_STATS.execute("SELECT * FROM subreddit_stats_posts")
     stats_results = database.CURSOR_STATS.fetchall()
     for entry in stats_results:
-        sub_data = literal_eval(entry[1])
+        sub_data = json.loads(entry[1])
         for day in list_of_days:
             if day not in sub_data:
                 continue
@@ -614,7 +645,7 @@ def external_artemis_monthly_statistics(month_string):
     CURSOR_STATS_1.execute("SELECT * FROM subreddit_stats_posts")
     stats_results_1 = CURSOR_STATS_1.fetchall()
     for entry in stats_results_1:
-        sub_data = literal_eval(entry[1])
+        sub_data = json.loads(entry[1])
         for day in list_of_days:
             if day not in sub_data:
                 continue
@@ -626,7 +657,7 @@ def external_artemis_monthly_statistics(month_string):
             posts_total += day_amount
 
     # This also adds a final line summing up everything.
-    for day in list(sorted(posts.keys())):
+    for day in sorted(posts):
         line = "| {} | {:,} |".format(day, posts[day])
         list_of_posts.append(line)
     list_of_posts.append("| **Total** | {:,} |".format(posts_total))
@@ -725,6 +756,9 @@ def external_database_splitter():
         database.CURSOR_STATS.execute(command)
         database.CONN_STATS.commit()
         logger.info("Completed copying statistics database table `{}`.".format(table))
+    # The donor database predates the JSON storage, so convert the rows
+    # that were just copied from it.
+    database.json_migrate_stats()
 
     # Deal with subreddit actions.
     actions_main = [
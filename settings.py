@@ -65,5 +65,7 @@ def load_instances(instance_num=99):
 
 
 # Retrieve credentials data needed to log in from the YAML file.
-INFO = SimpleNamespace(**load_information()[0])
-SETTINGS = SimpleNamespace(**load_information()[1])
+# Both files are read once and shared by the two namespaces.
+INFO_DATA, SETTINGS_DATA = load_information()
+INFO = SimpleNamespace(**INFO_DATA)
+SETTINGS = SimpleNamespace(**SETTINGS_DATA)
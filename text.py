@@ -215,19 +215,19 @@ MSG_MOD_LEAVE = """
 # The following are messages to users reminding them to use post flairs.
 MSG_USER_FLAIR_SUBJECT = "[Notification] ⚠️ Your post on r/{} needs a post flair!"
 MSG_USER_FLAIR_BODY = """
-Hey there u/{0},
+Hey there u/{username},
 
-Thanks for submitting your post to r/{1}!
+Thanks for submitting your post to r/{subreddit}!
 
-> **[{8}]({3})**
+> **[{title}]({permalink})**
 
 This is a friendly reminder that this community's moderators have \
 asked for all posts to have a *post flair* \
 (a relevant tag or category).
 
-{9}
+{custom_text}
 
-{5}
+{removal}
 
 **You can select a post flair by**:
 
@@ -242,24 +242,24 @@ View a GIF below to show you how!
 *[Boost](https://i.imgur.com/8h4Zpw3.gifv)* • \
 *[Relay](https://i.imgur.com/2g7s4jk.gifv)* • \
 *[RIF](https://i.imgur.com/179de1o.gifv)*
-{7}
+{flair_option}
 
 **The following post flairs are available**:
 
-{2}
+{templates}
 
 Post flairs help keep this community organized and allow subscribers to easily sort through the \
-posts they want to see. [Please contact the mods of r/{1} if you have any questions.]({4}) \
-Thank you very much, and {6}!
+posts they want to see. [Please contact the mods of r/{subreddit} if you have any \
+questions.]({modmail_link}) Thank you very much, and {goodbye}!
 """
 MSG_USER_FLAIR_BODY_MESSAGING = (
     "\n* ↩️ *or* replying to this message with just the text of a "
     "flair listed below. Capitalization does not matter."
 )
 MSG_USER_FLAIR_MODMAIL_LINK = (
-    "https://www.reddit.com/message/compose?to=%2Fr%2F{}&subject="
+    "https://www.reddit.com/message/compose?to=%2Fr%2F{subreddit}&subject="
     "About+My+Unflaired+Post&message="
-    "About+my+post+%5Bhere%5D%28{}%29..."
+    "About+my+post+%5Bhere%5D%28{permalink}%29..."
 )
 MSG_USER_FLAIR_REMOVAL = (
     "**Your post has been removed but will be automatically restored if you "
@@ -345,9 +345,9 @@ WIKIPAGE_PS_ERROR = """
 due to Pushshift aggregations being disabled \
 (see [here](https://redd.it/jm8yyt) on r/Pushshift).
 """
-# This is a list of goodbye phrases.
+# This is a tuple of goodbye phrases.
 # Artemis chooses a random one when sending a message.
-GOODBYE_PHRASES = [
+GOODBYE_PHRASES = (
     "Adieu",
     "Adiós",
     "All the best",
@@ -384,7 +384,9 @@ GOODBYE_PHRASES = [
     "Toodeloo",
     "Tschüss",
     "Until next time",
-]
+)
+# The same phrases in lowercase, for use in the middle of a sentence.
+GOODBYE_PHRASES_LOWER = tuple(x.lower() for x in GOODBYE_PHRASES)
 # This is the default Artemis configuration as expressed in YAML.
 # In dictionary form it's rendered as:
 # {'flair_enforce_approve_posts': True,
@@ -6,6 +6,7 @@ formatting.
 import calendar
 import datetime
 import time
+from functools import lru_cache
 
 import pytz
 
@@ -34,9 +35,7 @@ def convert_to_string(unix_integer):
     :param unix_integer: Any UNIX time number.
     :return: A string formatted with UTC time.
     """
-    i = int(unix_integer)
-    f = "%Y-%m-%d"
-    date_string = datetime.datetime.utcfromtimestamp(i).strftime(f)
+    date_string = time.strftime("%Y-%m-%d", time.gmtime(int(unix_integer)))
 
     return date_string
 
@@ -62,11 +61,29 @@ def month_convert_to_string(unix_integer):
     :param unix_integer: Any UNIX time number.
     :return: A month string formatted as YYYY-MM.
     """
-    month_string = datetime.datetime.utcfromtimestamp(int(unix_integer)).strftime("%Y-%m")
+    utc_time = time.gmtime(int(unix_integer))
+    month_string = "{:04d}-{:02d}".format(utc_time.tm_year, utc_time.tm_mon)
 
     return month_string
 
 
+@lru_cache(maxsize=256)
+def month_boundaries(month_string):
+    """Gets the number of days in a month and the Unix times at which it
+    starts and ends in UTC. The results are cached, since this is asked
+    for the same months by every subreddit during the statistics run.
+
+    :param month_string: A month string formatted as YYYY-MM.
+    :return: A tuple of the number of days in the month, the Unix time
+             at its start, and the Unix time at the start of the next.
+    """
+    year, month = [int(x) for x in month_string.split("-")]
+    days_in_month = calendar.monthrange(year, month)[1]
+    month_start = convert_to_unix("{}-01".format(month_string))
+
+    return days_in_month, month_start, month_start + days_in_month * 86400
+
+
 def convert_weekday_text(day_string):
     """This simple function converts a weekday abbreviation to its full
     English form, or vice versa.
@@ -87,9 +104,8 @@ def num_days_between(start_day, end_day):
     :param end_day: The day we end counting at.
     :return: An integer with the number of days.
     """
-    f = "%Y-%m-%d"
-    end = datetime.datetime.strptime(end_day, f)
-    days_difference = abs((end - datetime.datetime.strptime(start_day, f)).days)
+    end = datetime.date.fromisoformat(end_day)
+    days_difference = abs((end - datetime.date.fromisoformat(start_day)).days)
 
     return days_difference
 
@@ -109,18 +125,15 @@ def get_series_of_days(start_day, end_day):
     :return: A list of days in the YYYY-MM-DD format.
     """
     days_list = []
-    f = "%Y-%m-%d"
-
-    # Convert our date strings into datetime objects.
-    start_day = datetime.datetime.strptime(start_day, f)
-    end_day = datetime.datetime.strptime(end_day, f)
 
-    # Derive the time difference between the two dates.
-    delta = end_day - start_day
+    # Convert our date strings into date objects as ordinals, which are
+    # simply the number of days since 0001-01-01.
+    start_day = datetime.date.fromisoformat(start_day).toordinal()
+    end_day = datetime.date.fromisoformat(end_day).toordinal()
 
     # Iterate and get steps, a day each, and append each to the list.
-    for i in range(delta.days + 1):
-        days_list.append(str((start_day + datetime.timedelta(i)).strftime(f)))
+    for i in range(start_day, end_day + 1):
+        days_list.append(datetime.date.fromordinal(i).isoformat())
 
     return days_list
 